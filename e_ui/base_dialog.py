@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import List, Optional, Any, Callable, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 from PySide6.QtCore import (
     Qt, QModelIndex, QTimer, QSettings, QByteArray, QPoint, QEvent, 
     QThreadPool, QRegularExpression
@@ -11,13 +12,64 @@ from PySide6.QtWidgets import (
     QMessageBox, QHBoxLayout, QComboBox, QCheckBox, QToolButton, QHeaderView, 
     QAbstractItemView, QApplication
 )
-from e_ui.theme import theme_bus, theme_colors, current_theme_name
+from e_ui.theme import theme_bus, theme_colors, current_theme_name, status_brushes
 from e_ui.table_models import TableDataModel, ExtendedSortFilterProxyModel
 from e_ui.table_delegates import CellDelegate
 from e_ui.loading_overlay import LoadingOverlay
 from e_ui.chart_dialog import ColumnChartDialog
-from e_ui.indexing import IndexSignals, IndexTask
-from e_ui.utils import to_datetime
+from e_ui.indexing import IndexCoordinator, IndexSignals
+from e_ui.utils import to_datetime_array
+
+_ONE_DAY = timedelta(days=1)
+_PERIOD_BACK: dict[str, timedelta] = {
+    "1d": timedelta(days=0),
+    "1w": timedelta(days=6),
+    "1m": timedelta(days=29),
+    "3m": timedelta(days=89),
+    "6m": timedelta(days=179),
+}
+
+def _segments_and_accumulate(events: list[tuple[datetime, Optional[str]]], start: datetime, clip_end: datetime,
+                             edges: list[tuple[datetime, datetime]], unit_div: float) -> dict[str, list[float]]:
+    data: dict[str, list[float]] = {}
+    if clip_end <= start or not edges:
+        return data
+    end_s = (clip_end - start).total_seconds()
+    segs: list[tuple[float, float, Optional[str]]] = []
+    cur_t = 0.0
+    cur_status: Optional[str] = None
+    for t, st in events:
+        off = (t - start).total_seconds()
+        if off < 0:
+            cur_status = st
+            continue
+        if off > end_s:
+            break
+        if cur_t < off:
+            segs.append((cur_t, off, cur_status))
+        cur_t = off
+        cur_status = st
+    if cur_t < end_s:
+        segs.append((cur_t, end_s, cur_status))
+    n = len(edges)
+    lo = [(a - start).total_seconds() for a, _ in edges]
+    hi = [(b - start).total_seconds() for _, b in edges]
+    j = 0
+    for a, b, st in segs:
+        if st is None:
+            continue
+        row = data.get(st)
+        if row is None:
+            row = data[st] = [0.0] * n
+        while j < n and hi[j] <= a:
+            j += 1
+        k = j
+        while k < n and lo[k] < b:
+            ov = min(b, hi[k]) - max(a, lo[k])
+            if ov > 0:
+                row[k] += ov / unit_div
+            k += 1
+    return data
 
 class BaseTableDialog(QDialog):
     SETTINGS_ORG = "MyCompany"
@@ -26,6 +78,7 @@ class BaseTableDialog(QDialog):
     def __init__(self, parent: QWidget, title: str, headers: List[str]) -> None:
         super().__init__(parent)
         self.setWindowTitle(title)
+        self._settings_key_str = f"BaseTableDialog/{title}"
         self.resize(1000, 640)
         self._headers = headers[:]
         self._settings = QSettings(self.SETTINGS_ORG, self.SETTINGS_APP)
@@ -41,8 +94,12 @@ class BaseTableDialog(QDialog):
         self._loaded_count = 0
         self._indexing_token = 0
         self._indexing_running = False
+        self._index_pending: Optional[Tuple[Tuple[int, ...], bool, bool]] = None
+        self._indexer: Optional[IndexCoordinator] = None
         self._pool = QThreadPool.globalInstance()
         self.model = TableDataModel(headers, parent=self)
+        self._header_labels: List[str] = []
+        self._refresh_header_labels()
         self.proxy = ExtendedSortFilterProxyModel(self)
         self.proxy.setSourceModel(self.model)
         self.proxy.setDynamicSortFilter(True)
@@ -119,6 +176,7 @@ class BaseTableDialog(QDialog):
             highlight_brush=self._make_highlight_brush()
         )
         self.table.setItemDelegate(self._delegate)
+        self.model.modelReset.connect(self._delegate.invalidate_regex)
         root.addWidget(self.table, 1)
         nav = QHBoxLayout()
         self.lbl_page = QLabel("0 rows", self)
@@ -148,6 +206,12 @@ class BaseTableDialog(QDialog):
         self._overlay = LoadingOverlay(self.table.viewport())
         self.table.viewport().installEventFilter(self)
         self._period_key: str = "1d"
+        self._status_brush_cache: dict[Optional[str], QBrush] = {}
+        self._rebuild_status_brushes()
+        self._theme_timer = QTimer(self)
+        self._theme_timer.setSingleShot(True)
+        self._theme_timer.setInterval(16)
+        self._theme_timer.timeout.connect(self._apply_theme_change)
         theme_bus.changed.connect(self._on_theme_changed)
         self.setWindowFlags(self.windowFlags() | Qt.Window | Qt.WindowMinMaxButtonsHint | Qt.WindowCloseButtonHint)
         self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
@@ -180,6 +244,10 @@ class BaseTableDialog(QDialog):
         self._filter_timer.setSingleShot(True)
         self._filter_timer.setInterval(300)
         self._filter_timer.timeout.connect(self._apply_filter)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(500)
+        self._save_timer.timeout.connect(self._save_settings)
         self.search.textChanged.connect(self._on_filter_input_changed)
         self.cmb_column.currentIndexChanged.connect(self._apply_filter)
         self.chk_regex.toggled.connect(self._apply_filter)
@@ -197,27 +265,8 @@ class BaseTableDialog(QDialog):
         self._period_key = key or "1d"
 
     def _period_range_for_key(self, key: str) -> tuple[datetime, datetime]:
-        now = datetime.now()
-        today0 = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        if key == "1d":
-            start = today0
-            end_axis = today0 + timedelta(days=1)
-        elif key == "1w":
-            start = today0 - timedelta(days=6)
-            end_axis = today0 + timedelta(days=1)
-        elif key == "1m":
-            start = today0 - timedelta(days=29)
-            end_axis = today0 + timedelta(days=1)
-        elif key == "3m":
-            start = today0 - timedelta(days=89)
-            end_axis = today0 + timedelta(days=1)
-        elif key == "6m":
-            start = today0 - timedelta(days=179)
-            end_axis = today0 + timedelta(days=1)
-        else:
-            start = today0 - timedelta(days=29)
-            end_axis = today0 + timedelta(days=1)
-        return start, end_axis
+        today0 = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today0 - _PERIOD_BACK.get(key, _PERIOD_BACK["1m"]), today0 + _ONE_DAY
 
     def _rows_events(self) -> list[tuple[datetime, Optional[str]]]:
         try:
@@ -226,44 +275,16 @@ class BaseTableDialog(QDialog):
             s_idx = h.index("equip_status") if "equip_status" in h else -1
         except Exception:
             return []
+        rows = self._all_rows
+        ts = to_datetime_array([r[t_idx] for r in rows])
+        valid = np.flatnonzero(~np.isnat(ts))
+        order = valid[np.argsort(ts[valid], kind="stable")]
         out = []
-        for r in self._all_rows:
-            t = r[t_idx] if t_idx < len(r) else None
-            dt = to_datetime(t)
-            if not dt:
-                continue
-            st = r[s_idx] if 0 <= s_idx < len(r) else None
-            st = str(st) if st is not None else None
-            out.append((dt, st))
-        out.sort(key=lambda x: x[0])
+        for i, dt in zip(order.tolist(), ts[order].astype(object)):
+            st = rows[i][s_idx] if s_idx >= 0 else None
+            out.append((dt, str(st) if st is not None else None))
         return out
 
-    def _build_segments_in_range(self, events: list[tuple[datetime, Optional[str]]], 
-                                 start: datetime, clip_end: datetime) -> list[tuple[datetime, datetime, Optional[str]]]:
-        segs: list[tuple[datetime, datetime, Optional[str]]] = []
-        if clip_end <= start:
-            return segs
-        initial_status: Optional[str] = None
-        for t, s in events:
-            if t < start:
-                initial_status = s
-            else:
-                break
-        cur_t = start
-        cur_status = initial_status
-        for t, s in events:
-            if t < start:
-                continue
-            if t > clip_end:
-                break
-            if cur_t < t:
-                segs.append((cur_t, t, cur_status))
-            cur_t = t
-            cur_status = s
-        if cur_t < clip_end:
-            segs.append((cur_t, clip_end, cur_status))
-        return segs
-
     def _bucket_edges(self, key: str, start: datetime, end_axis: datetime, 
                       clip_end: datetime) -> tuple[list[str], list[tuple[datetime, datetime]], str, list[float]]:
         edges: list[tuple[datetime, datetime]] = []
@@ -298,33 +319,6 @@ class BaseTableDialog(QDialog):
                 day = b
         return labels, edges, unit, bucket_totals
 
-    def _accumulate_by_bucket(self, segs: list[tuple[datetime, datetime, Optional[str]]], 
-                              edges: list[tuple[datetime, datetime]], 
-                              unit: str) -> tuple[dict[str, list[float]], list[str]]:
-        data: dict[str, list[float]] = {}
-        for _, _, st in segs:
-            if st is None:
-                continue
-            if st not in data:
-                data[st] = [0.0] * len(edges)
-        for (s, e, st) in segs:
-            if st is None:
-                continue
-            for i, (ba, bb) in enumerate(edges):
-                a = max(s, ba)
-                b = min(e, bb)
-                if b <= a:
-                    continue
-                val = (b - a).total_seconds()
-                if unit == "min":
-                    val /= 60.0
-                else:
-                    val /= 3600.0
-                data.setdefault(st, [0.0] * len(edges))
-                data[st][i] += val
-        ordered_statuses = list(data.keys())
-        return data, ordered_statuses
-
     def _open_chart(self):
         h = self.model.headers()
         if "equip_status" not in h or "event_time" not in h:
@@ -337,9 +331,9 @@ class BaseTableDialog(QDialog):
         now = datetime.now()
         clip_end = min(e_axis, now)
         events = self._rows_events()
-        segs = self._build_segments_in_range(events, s, clip_end)
         labels, edges, unit, bucket_totals = self._bucket_edges(self._period_key, s, e_axis, clip_end)
-        data, ordered_statuses = self._accumulate_by_bucket(segs, edges, unit)
+        data = _segments_and_accumulate(events, s, clip_end, edges, 60.0 if unit == "min" else 3600.0)
+        ordered_statuses = list(data.keys())
         if not data:
             QMessageBox.information(self, "Chart", "Không có dữ liệu trong khoảng được chọn.")
             return
@@ -368,9 +362,17 @@ class BaseTableDialog(QDialog):
 
     def _on_theme_changed(self, name: str, colors: object):
         self._theme_name = name
+        self._theme_timer.start()
+
+    def _apply_theme_change(self):
         self._delegate.set_highlight_brush(self._make_highlight_brush())
+        self._rebuild_status_brushes()
         self.table.viewport().update()
 
+    def _rebuild_status_brushes(self):
+        alpha = self._status_alpha_light if self._theme_name == "light" else self._status_alpha_dark
+        self._status_brush_cache = status_brushes(self._theme_name, alpha)
+
     def _make_highlight_brush(self) -> QBrush:
         colors = theme_colors(self._theme_name)
         accent = str(colors["primary"])
@@ -404,10 +406,10 @@ class BaseTableDialog(QDialog):
         if self._time_col_idx is None:
             return self._all_rows[:]
         idx = self._time_col_idx
-        def key_fn(r: List[Any]):
-            dt = to_datetime(r[idx] if idx < len(r) else None)
-            return dt or datetime.min
-        return sorted(self._all_rows, key=key_fn, reverse=True)
+        rows = self._all_rows
+        ts = to_datetime_array([r[idx] for r in rows]).view("i8")
+        order = len(rows) - 1 - np.argsort(ts[::-1], kind="stable")[::-1]
+        return [rows[i] for i in order.tolist()]
 
     def _apply_pagination(self):
         if not self._all_rows:
@@ -418,12 +420,19 @@ class BaseTableDialog(QDialog):
         sorted_rows = self._sorted_all_rows()
         view_rows = sorted_rows[: self._loaded_count]
         self.model.set_rows(view_rows)
+        self._indexing_token += 1
+        self._index_pending = None
         self._update_nav()
         self._start_indexing_if_needed()
         self._apply_filter()
 
+    def _refresh_header_labels(self):
+        self._header_labels = [str(self.model.headerData(c, Qt.Horizontal)) for c in range(self.model.columnCount())]
+
     def load_rows(self, rows: List[List[Any]]):
-        self._all_rows = rows[:]
+        self._refresh_header_labels()
+        nh = len(self._headers)
+        self._all_rows = [r if len(r) >= nh else list(r) + [None] * (nh - len(r)) for r in rows]
         self._loaded_count = min(len(self._all_rows), self._page_size)
         self._apply_pagination()
         self._autosize_columns(initial=True)
@@ -443,30 +452,31 @@ class BaseTableDialog(QDialog):
         self._apply_pagination()
 
     def show_row_detail(self, index: QModelIndex):
-        row = index.row()
-        cols = range(self.proxy.columnCount())
-        row_data = [self.proxy.data(self.proxy.index(row, c)) for c in cols]
-        text = "\n".join(f"{self.model.headerData(i, Qt.Orientation.Horizontal)}: {row_data[i]}" for i in cols)
+        src = self.model._rows[self.proxy.mapToSource(index).row()]
+        text = "\n".join(f"{h}: {'' if src[c] is None else src[c]}" for c, h in enumerate(self._header_labels))
         QMessageBox.information(self, "Row Detail", text)
 
     def copy_selection_to_clipboard(self, with_headers: bool = True, sep: str = "\t"):
         sm = self.table.selectionModel()
         if not sm or not sm.hasSelection():
             return
-        indexes = sm.selectedIndexes()
-        rows = sorted({i.row() for i in indexes})
+        by_row: dict[int, set[int]] = {}
+        for i in sm.selectedIndexes():
+            by_row.setdefault(i.row(), set()).add(i.column())
         hh = self.table.horizontalHeader()
-        cols = sorted({i.column() for i in indexes}, key=lambda c: hh.visualIndex(c))
-        sel_set = {(i.row(), i.column()) for i in indexes}
+        cols = sorted(set().union(*by_row.values()), key=lambda c: hh.visualIndex(c))
         lines = []
         if with_headers:
-            headers = [self.model.headerData(c, Qt.Horizontal) for c in cols]
-            lines.append(sep.join(str(h) for h in headers))
-        for r in rows:
-            vals = []
-            for c in cols:
-                vals.append("" if (r, c) not in sel_set else str(self.proxy.index(r, c).data() or ""))
-            lines.append(sep.join(vals))
+            headers = self._header_labels
+            lines.append(sep.join(headers[c] if c < len(headers) else "" for c in cols))
+        src_rows = self.model._rows
+        for r in sorted(by_row):
+            sel = by_row[r]
+            src = src_rows[self.proxy.mapToSource(self.proxy.index(r, 0)).row()]
+            lines.append(sep.join(
+                str(src[c]) if c in sel and src[c] is not None else ""
+                for c in cols
+            ))
         QApplication.clipboard().setText("\n".join(lines))
 
     def _escape_action(self):
@@ -498,6 +508,7 @@ class BaseTableDialog(QDialog):
             logic_and=logic_and,
             key_col=key_col,
         )
+        self._delegate.invalidate_regex()
         self._maybe_index_for_filter()
         self._update_counts()
         self.table.viewport().update()
@@ -525,6 +536,8 @@ class BaseTableDialog(QDialog):
             cols = (key_col,)
         case_sensitive = self.chk_case.isChecked()
         ignore_accents = self.chk_no_accent.isChecked()
+        if self.proxy.cache_matches(cols, (case_sensitive, ignore_accents)):
+            return
         self._start_indexing(cols, case_sensitive, ignore_accents)
 
     def _start_indexing_if_needed(self):
@@ -542,31 +555,36 @@ class BaseTableDialog(QDialog):
         self._start_indexing(cols, case_sensitive, ignore_accents)
 
     def _start_indexing(self, cols: Tuple[int, ...], case_sensitive: bool, ignore_accents: bool):
-        if self._indexing_running:
-            return
-        rows_snapshot = [r[:] for r in self.model._rows]
         token = self._indexing_token + 1
         self._indexing_token = token
+        if self._indexing_running:
+            self._index_pending = (cols, case_sensitive, ignore_accents)
+            return
+        rows_snapshot = self.model._rows
+        self._indexing_running = True
         self._overlay.start("Indexing...")
         sig = IndexSignals()
         sig.finished.connect(self._on_index_done)
         sig.error.connect(self._on_index_error)
-        task = IndexTask(rows_snapshot, cols, case_sensitive, ignore_accents, token, sig)
-        self._pool.start(task)
+        self._indexer = IndexCoordinator(sig, self)
+        self._indexer.start(self._pool, rows_snapshot, cols, case_sensitive, ignore_accents, token)
 
     def _on_index_done(self, cache: object, cols_key: tuple, norm_key: tuple, token: int):
-        if token != self._indexing_token:
-            self._indexing_running = False
-            self._overlay.stop()
-            return
-        cache_list = cache if isinstance(cache, list) else []
-        self.proxy.set_prebuilt_cache(cache_list, tuple(cols_key), tuple(norm_key))
-        self._indexing_running = False
-        self._overlay.stop()
+        if token == self._indexing_token:
+            fields, joined = cache if isinstance(cache, tuple) else ([], None)
+            self.proxy.set_prebuilt_cache(fields, tuple(cols_key), tuple(norm_key), joined)
+        self._finish_indexing()
 
     def _on_index_error(self, msg: str, token: int):
+        self._finish_indexing()
+
+    def _finish_indexing(self):
         self._indexing_running = False
-        self._overlay.stop()
+        pending, self._index_pending = self._index_pending, None
+        if pending is not None:
+            self._start_indexing(*pending)
+        else:
+            self._overlay.stop()
 
     def _update_counts(self):
         total_all = len(self._all_rows)
@@ -600,12 +618,8 @@ class BaseTableDialog(QDialog):
         val = index.data()
         if not isinstance(val, str):
             val = str(val) if val is not None else ""
-        colors = theme_colors(self._theme_name)
-        status_map = colors["status"]
-        hexc = status_map.get(val, status_map.get(None, "#00000000"))
-        c = QColor(hexc)
-        c.setAlpha(self._status_alpha_light if self._theme_name == "light" else self._status_alpha_dark)
-        return QBrush(c)
+        cache = self._status_brush_cache
+        return cache.get(val, cache.get(None))
 
     def _autosize_columns(self, initial: bool = False):
         hh = self.table.horizontalHeader()
@@ -616,7 +630,7 @@ class BaseTableDialog(QDialog):
             self.table.setColumnWidth(c, max(w, 80))
         hh.setSectionResizeMode(QHeaderView.Interactive)
         if not initial:
-            self._save_settings()
+            self._save_timer.start()
 
     def _show_table_menu(self, pos: QPoint):
         menu = QMenu(self)
@@ -673,7 +687,7 @@ class BaseTableDialog(QDialog):
         return order
 
     def _settings_key(self) -> str:
-        return f"BaseTableDialog/{self.windowTitle()}"
+        return self._settings_key_str
 
     def _save_settings(self):
         key = self._settings_key()
@@ -694,5 +708,6 @@ class BaseTableDialog(QDialog):
             self.table.horizontalHeader().restoreState(hdr)
 
     def closeEvent(self, e):
+        self._save_timer.stop()
         self._save_settings()
         super().closeEvent(e)
\ No newline at end of file
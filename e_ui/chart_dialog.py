@@ -1,15 +1,22 @@
 from __future__ import annotations
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QBrush, QPainter, QCursor
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QWidget, QToolTip
-from PySide6.QtCharts import QChart, QChartView, QStackedBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
+
+def _fmt_value(val: float, unit: str) -> str:
+    if unit == "min":
+        return f"{val:.0f} min"
+    minutes = int(round(val * 60))
+    h, m = divmod(minutes, 60)
+    return f"{h}h {m}m" if h > 0 else f"{m}m"
 
 class ColumnChartDialog(QDialog):
     def __init__(self, parent: QWidget, title: str, categories: List[str], 
                  data: Dict[str, List[float]], ordered_statuses: List[str], 
                  unit: str, bucket_totals: List[float], 
                  color_map: Dict[str, QColor], theme: str = "light"):
+        from PySide6.QtCharts import QChart, QChartView, QStackedBarSeries, QBarSet, QBarCategoryAxis, QValueAxis
         super().__init__(parent)
         self.setWindowTitle(title)
         lay = QVBoxLayout(self)
@@ -17,9 +24,16 @@ class ColumnChartDialog(QDialog):
         chart = QChart()
         chart.setTitle(title)
         series = QStackedBarSeries()
+        self._tips: Dict[str, List[str]] = {}
+        self._last_tip_key: Tuple[Optional[str], int] = (None, -1)
         for st in ordered_statuses:
             vals = data.get(st, [0.0] * len(categories))
-            bs = QBarSet(st or "Unknown")
+            label = st or "Unknown"
+            self._tips[label] = [
+                f"{cat}\n{label}: {_fmt_value(val, unit)} ({(val / total * 100.0) if total > 0 else 0.0:.1f}%)"
+                for cat, val, total in zip(categories, vals, bucket_totals)
+            ]
+            bs = QBarSet(label)
             bs.append(vals)
             col = color_map.get(st)
             if col is not None:
@@ -46,28 +60,28 @@ class ColumnChartDialog(QDialog):
         series.attachAxis(axisY)
         chart.legend().setVisible(True)
         chart.legend().setAlignment(Qt.AlignBottom)
+        chart.setAnimationOptions(QChart.NoAnimation)
         view = QChartView(chart)
+        try:
+            from PySide6.QtOpenGLWidgets import QOpenGLWidget
+            view.setViewport(QOpenGLWidget())
+        except Exception:
+            pass
         view.setRenderHint(QPainter.Antialiasing, True)
         lay.addWidget(view)
         
         def on_hover(status: bool, index: int, barset: QBarSet):
             if not status:
-                QToolTip.hideText()
+                if self._last_tip_key != (None, -1):
+                    self._last_tip_key = (None, -1)
+                    QToolTip.hideText()
+                return
+            key = (barset.label(), index)
+            if key == self._last_tip_key:
                 return
-            st = barset.label()
-            val = barset.at(index)
-            total = bucket_totals[index] if 0 <= index < len(bucket_totals) else 0.0
-            pct = (val / total * 100.0) if total > 0 else 0.0
-            if unit == "min":
-                txt_val = f"{val:.0f} min"
-            else:
-                minutes = int(round(val * 60))
-                h = minutes // 60
-                m = minutes % 60
-                txt_val = f"{h}h {m}m" if h > 0 else f"{m}m"
-            cat = categories[index] if 0 <= index < len(categories) else ""
-            tip = f"{cat}\n{st}: {txt_val} ({pct:.1f}%)"
-            QToolTip.showText(QCursor.pos(), tip, self)
+            self._last_tip_key = key
+            tips = self._tips.get(key[0], ())
+            QToolTip.showText(QCursor.pos(), tips[index] if 0 <= index < len(tips) else "", self)
         
         series.hovered.connect(on_hover)
         self.setWindowFlags(self.windowFlags() | Qt.Window | Qt.WindowMinMaxButtonsHint | Qt.WindowCloseButtonHint)
@@ -1,38 +1,42 @@
 from __future__ import annotations
-from typing import List
+from typing import List, Tuple
+from operator import itemgetter
 from e_ui.base_dialog import BaseTableDialog
 
-class StatusDialog(BaseTableDialog):
-    def __init__(self, parent, equip_code: str, rows: List[dict]):
-        headers = ["equip_code", "equip_status", "event_time"]
-        super().__init__(parent, f"Status {equip_code}", headers)
-        self.set_status_column(1)
-        self.set_time_column_by_header("event_time")
-        formatted = [[r.get("equip_code", ""), r.get("equip_status", ""), r.get("event_time", "")] for r in rows]
-        self.load_rows(formatted)
+STATUS_KEYS = ("equip_code", "equip_status", "event_time")
+INPUT_KEYS = ("equip_code", "material_batch", "feeding_time")
 
-class WipDialog(BaseTableDialog):
-    def __init__(self, parent, equip_code: str, rows: List[dict]):
-        headers = ["equip_code", "equip_status", "event_time"]
-        super().__init__(parent, f"WIP {equip_code}", headers)
-        self.set_status_column(1)
-        self.set_time_column_by_header("event_time")
-        formatted = [[r.get("equip_code", ""), r.get("equip_status", ""), r.get("event_time", "")] for r in rows]
-        self.load_rows(formatted)
+def rows_to_matrix(rows: List[dict], keys: Tuple[str, ...]) -> List[list]:
+    getter = itemgetter(*keys)
+    out: List[list] = []
+    append = out.append
+    for r in rows:
+        try:
+            append(list(getter(r)))
+        except KeyError:
+            append([r.get(k, "") for k in keys])
+    return out
+
+class _StatusTableDialog(BaseTableDialog):
+    TITLE = "Status"
 
-class EipDialog(BaseTableDialog):
     def __init__(self, parent, equip_code: str, rows: List[dict]):
-        headers = ["equip_code", "equip_status", "event_time"]
-        super().__init__(parent, f"EIP {equip_code}", headers)
+        super().__init__(parent, f"{self.TITLE} {equip_code}", list(STATUS_KEYS))
         self.set_status_column(1)
         self.set_time_column_by_header("event_time")
-        formatted = [[r.get("equip_code", ""), r.get("equip_status", ""), r.get("event_time", "")] for r in rows]
-        self.load_rows(formatted)
+        self.load_rows(rows_to_matrix(rows, STATUS_KEYS))
+
+class StatusDialog(_StatusTableDialog):
+    pass
+
+class WipDialog(_StatusTableDialog):
+    TITLE = "WIP"
+
+class EipDialog(_StatusTableDialog):
+    TITLE = "EIP"
 
 class InputDialog(BaseTableDialog):
     def __init__(self, parent, equip_code: str, rows: List[dict]):
-        headers = ["equip_code", "material_batch", "feeding_time"]
-        super().__init__(parent, f"Input {equip_code}", headers)
+        super().__init__(parent, f"Input {equip_code}", list(INPUT_KEYS))
         self.set_time_column_by_header("feeding_time")
-        formatted = [[r.get("equip_code", ""), r.get("material_batch", ""), r.get("feeding_time", "")] for r in rows]
-        self.load_rows(formatted)
\ No newline at end of file
+        self.load_rows(rows_to_matrix(rows, INPUT_KEYS))
\ No newline at end of file
@@ -1,9 +1,9 @@
 from __future__ import annotations
 from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
-from bisect import bisect_right
-from PySide6.QtCore import Qt, QRectF, QSize, QPointF, Signal
-from PySide6.QtGui import QColor, QPainter, QPen, QBrush, QFont, QCursor
+import numpy as np
+from PySide6.QtCore import Qt, QEvent, QRectF, QSize, QPointF, QTimer, Signal
+from PySide6.QtGui import QColor, QPainter, QPainterPath, QPen, QBrush, QFont, QCursor, QPixmap, QPaintDevice, QRegion
 from PySide6.QtWidgets import QWidget, QToolTip
 from e_ui.theme import theme_bus, theme_colors, current_theme_name
 
@@ -26,9 +26,13 @@ class GanttStrip(QWidget):
         self._theme_name = current_theme_name()
         self._code: Optional[str] = None
         self._segments: List[Tuple[datetime, datetime, Optional[str]]] = []
-        self._starts: List[datetime] = []
+        self._seg_secs = np.zeros((0, 2), dtype=np.float64)
+        self._seg_starts = np.zeros(0, dtype=np.float64)
+        self._seg_buf, self._starts_buf = self._seg_secs, self._seg_starts
         self._start: Optional[datetime] = None
         self._end: Optional[datetime] = None
+        self._total = 1.0
+        self._inv_total = 1.0
         self._placeholder: str = "No device selected"
         self._hover_x: Optional[float] = None
         self._hover_t: Optional[datetime] = None
@@ -42,10 +46,20 @@ class GanttStrip(QWidget):
         self._bar_h = 0.0
         self._bar_y = 0.0
         self._ticks: List[datetime] = []
+        self._tick_x = np.zeros(0, dtype=np.float64)
+        self._tick_labels: List[str] = []
+        self._now_x: Optional[float] = None
         self._geom_dirty = True
+        self._static_cache: Optional[QPixmap] = None
+        self._static_dirty = True
         self._cursor_pointing = False
         self._tooltip_last = ""
+        self._rebuild_luts()
+        self._rebuild_fonts()
         theme_bus.changed.connect(self._on_theme_changed)
+        self._now_timer = QTimer(self)
+        self._now_timer.timeout.connect(self._on_now_tick)
+        self._now_timer.start(30_000)
         self.setAttribute(Qt.WA_OpaquePaintEvent, True)
         self.setMouseTracking(True)
         self.setMinimumHeight(120)
@@ -55,14 +69,58 @@ class GanttStrip(QWidget):
 
     def _on_theme_changed(self, name: str, _):
         self._theme_name = name
-        self.update()
+        self._rebuild_luts()
+        self._invalidate_static()
+
+    def _rebuild_luts(self):
+        colors = theme_colors(self._theme_name)
+        light = self._theme_name == "light"
+        self._color_lut: dict[Optional[str], QColor] = {k: QColor(str(v)) for k, v in colors["status"].items()}
+        self._color_lut.setdefault(None, QColor(0, 0, 0, 0))
+        self._fill_lut: dict[Optional[str], QColor] = {}
+        for k, c in self._color_lut.items():
+            fill = QColor(c)
+            fill.setAlpha(160 if light else 180)
+            self._fill_lut[k] = fill
+        primary = QColor(str(colors["primary"]))
+        self._primary_color = primary
+        self._hover_color = QColor(primary)
+        self._hover_color.setAlpha(180)
+        self._now_pen = QPen(primary, 1.5)
+        self._cursor_pen = QPen(primary, 1)
+        grid_col = QColor(str(colors["text_alt"]))
+        grid_col.setAlpha(90 if light else 110)
+        self._grid_pen = QPen(grid_col, 1)
+        self._minor_pen = QPen(grid_col, 1, Qt.DotLine)
+        self._major_pen = QPen(grid_col, 1.5, Qt.DotLine)
+        self._bg_color = QColor(str(colors["surface"]))
+        self._text_color = QColor(str(colors["text"]))
+        self._text_pen = QPen(self._text_color, 1)
+        self._text_on_lut: dict[Optional[str], QColor] = {k: QColor(Qt.black) if self._luminance(c) > 0.5 else QColor(Qt.white) for k, c in self._color_lut.items()}
+        self._label_pens: dict[Optional[str], QPen] = {k: QPen(c, 1) for k, c in self._text_on_lut.items()}
+
+    def _rebuild_fonts(self):
+        base = self.font()
+        self._placeholder_font = QFont(base)
+        self._placeholder_font.setPointSizeF(max(10.0, base.pointSizeF()))
+        self._tick_font = QFont(base)
+        self._tick_font.setPointSizeF(max(9.0, base.pointSizeF() - 1))
+        self._label_font = QFont(self._tick_font)
+        self._label_font.setPointSizeF(max(8.5, self._tick_font.pointSizeF() - 1.5))
+
+    def changeEvent(self, e):
+        if e.type() == QEvent.FontChange:
+            self._rebuild_fonts()
+            self._invalidate_static()
+        super().changeEvent(e)
 
     def set_placeholder(self, text: Optional[str] = None):
         if text is not None:
             self._placeholder = text
         self._code = None
         self._segments = []
-        self._starts = []
+        self._seg_secs = np.zeros((0, 2), dtype=np.float64)
+        self._seg_starts = np.zeros(0, dtype=np.float64)
         self._start = None
         self._end = None
         self._hover_x = None
@@ -71,22 +129,89 @@ class GanttStrip(QWidget):
         self._selected_seg = None
         self._geom_dirty = True
         self._tooltip_last = ""
-        self.update()
+        self._invalidate_static()
 
     def set_segments(self, code: str, segments: List[Tuple[datetime, datetime, Optional[str]]], day_start: datetime, day_end: datetime):
         self._code = code
         self._segments = segments[:]
         self._segments.sort(key=lambda x: x[0])
-        self._starts = [s for s, _, _ in self._segments]
         self._start = day_start
         self._end = day_end
+        self._total = (day_end - day_start).total_seconds() or 1.0
+        self._inv_total = 1.0 / self._total
+        self._seg_secs = np.array([((s - day_start).total_seconds(), (e - day_start).total_seconds()) for s, e, _ in self._segments], dtype=np.float64).reshape(-1, 2)
+        self._seg_starts = np.ascontiguousarray(self._seg_secs[:, 0])
+        self._seg_buf, self._starts_buf = self._seg_secs, self._seg_starts
         self._hover_x = None
         self._hover_t = None
         self._hover_seg = None
         self._selected_seg = None
         self._geom_dirty = True
         self._tooltip_last = ""
-        self.update()
+        self._invalidate_static()
+
+    def update_segments(self, code: str, segments: List[Tuple[datetime, datetime, Optional[str]]], day_start: datetime, day_end: datetime):
+        cur = self._segments
+        n = len(cur)
+        if (n and code == self._code and day_start == self._start and day_end == self._end
+                and len(segments) in (n, n + 1) and segments[:n - 1] == cur[:n - 1]):
+            s, e, st = segments[n - 1]
+            if s == cur[-1][0] and st == cur[-1][2] and e >= cur[-1][1]:
+                self.extend_end(e)
+                if len(segments) > n:
+                    self.append_segment(*segments[n])
+                return
+        self.set_segments(code, segments, day_start, day_end)
+
+    def append_segment(self, s: datetime, e: datetime, st: Optional[str]):
+        if not self._code or not self._start or not self._end:
+            return
+        if self._segments and s < self._segments[-1][0]:
+            self.set_segments(self._code, self._segments + [(s, e, st)], self._start, self._end)
+            return
+        n = len(self._segments)
+        if n >= len(self._seg_buf):
+            cap = max(16, 2 * n)
+            buf = np.empty((cap, 2), dtype=np.float64)
+            buf[:n] = self._seg_buf[:n]
+            starts = np.empty(cap, dtype=np.float64)
+            starts[:n] = self._starts_buf[:n]
+            self._seg_buf, self._starts_buf = buf, starts
+        a = (s - self._start).total_seconds()
+        b = (e - self._start).total_seconds()
+        self._seg_buf[n] = (a, b)
+        self._starts_buf[n] = a
+        self._segments.append((s, e, st))
+        self._seg_secs = self._seg_buf[:n + 1]
+        self._seg_starts = self._starts_buf[:n + 1]
+        self._invalidate_span(a, b)
+
+    def extend_end(self, new_end: datetime):
+        if not self._segments or not self._start:
+            return
+        last = self._segments[-1]
+        if new_end <= last[1]:
+            return
+        seg = (last[0], new_end, last[2])
+        self._segments[-1] = seg
+        if self._hover_seg == last:
+            self._hover_seg = seg
+        if self._selected_seg == last:
+            self._selected_seg = seg
+        i = len(self._segments) - 1
+        a = float(self._seg_buf[i, 0])
+        b = (new_end - self._start).total_seconds()
+        self._seg_buf[i, 1] = b
+        self._invalidate_span(a, b)
+
+    def _invalidate_span(self, a: float, b: float):
+        self._static_dirty = True
+        if self._geom_dirty:
+            self.update()
+            return
+        left, right = self._area.left(), self._area.right()
+        x1, x2 = (left + (right - left) * max(0.0, min(1.0, v * self._inv_total)) for v in (a, b))
+        self.update(QRectF(x1 - 4, self._bar_y - 4, x2 - x1 + 8, self._bar_h + 8).toAlignedRect())
 
     def set_axis_visible(self, visible: bool):
         self._show_axis = bool(visible)
@@ -95,37 +220,37 @@ class GanttStrip(QWidget):
         else:
             self._margin_t, self._margin_b = 8, 8
         self._geom_dirty = True
-        self.update()
+        self._invalidate_static()
 
     def _time_to_x(self, t: datetime, left: float, right: float) -> float:
         if not self._start or not self._end:
             return left
-        total = (self._end - self._start).total_seconds() or 1.0
-        pos = (t - self._start).total_seconds()
-        pos = max(0.0, min(total, pos))
-        return left + (right - left) * (pos / total)
+        ratio = (t - self._start).total_seconds() * self._inv_total
+        return left + (right - left) * max(0.0, min(1.0, ratio))
 
-    def _x_to_time(self, x: float, left: float, right: float) -> Optional[datetime]:
+    def _segments_x(self, left: float, right: float) -> np.ndarray:
+        return left + (right - left) * np.clip(self._seg_secs * self._inv_total, 0.0, 1.0)
+
+    def _x_to_secs(self, x: float, left: float, right: float) -> Optional[float]:
         if not self._start or not self._end or right <= left:
             return None
         ratio = (x - left) / (right - left)
-        ratio = max(0.0, min(1.0, ratio))
-        delta = (self._end - self._start).total_seconds()
-        return self._start + timedelta(seconds=delta * ratio)
+        return self._total * max(0.0, min(1.0, ratio))
+
+    def _x_to_time(self, x: float, left: float, right: float) -> Optional[datetime]:
+        secs = self._x_to_secs(x, left, right)
+        return None if secs is None else self._start + timedelta(seconds=secs)
 
     def _status_color(self, status: Optional[str]) -> QColor:
-        colors = theme_colors(self._theme_name)
-        hexc = colors["status"].get(status, colors["status"].get(None, "#00000000"))
-        return QColor(str(hexc))
+        lut = self._color_lut
+        return lut.get(status, lut[None])
 
-    def _find_segment_at(self, t: datetime) -> Optional[Tuple[datetime, datetime, Optional[str]]]:
+    def _find_segment_at(self, secs: float) -> Optional[Tuple[datetime, datetime, Optional[str]]]:
         if not self._segments:
             return None
-        i = bisect_right(self._starts, t) - 1
-        if i >= 0:
-            s, e, st = self._segments[i]
-            if s <= t < e:
-                return s, e, st
+        i = int(np.searchsorted(self._seg_starts, secs, side="right")) - 1
+        if i >= 0 and secs < self._seg_secs[i, 1]:
+            return self._segments[i]
         return None
 
     def _hours_step(self, width_px: float) -> int:
@@ -157,12 +282,13 @@ class GanttStrip(QWidget):
         r, g, b = c.redF(), c.greenF(), c.blueF()
         return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
-    def _contrast_text_on(self, bg: QColor, default: QColor) -> QColor:
-        return QColor(Qt.black) if self._luminance(bg) > 0.5 else QColor(Qt.white)
-
     def _segment_rect(self, s: datetime, e: datetime, area: QRectF, bar_y: float, bar_h: float) -> QRectF:
         x1 = self._time_to_x(s, area.left(), area.right())
         x2 = self._time_to_x(e, area.left(), area.right())
+        return self._rect_between(x1, x2, area, bar_y, bar_h)
+
+    @staticmethod
+    def _rect_between(x1: float, x2: float, area: QRectF, bar_y: float, bar_h: float) -> QRectF:
         if x2 <= area.left() or x1 >= area.right():
             return QRectF()
         x1 = max(x1, area.left())
@@ -175,7 +301,27 @@ class GanttStrip(QWidget):
         self._bar_h = self._area.height()
         self._bar_y = self._area.top()
         self._ticks = self._aligned_hour_ticks(self._hours_step(self._area.width()))
+        secs = np.array([(t - self._start).total_seconds() for t in self._ticks], dtype=np.float64)
+        left, right = self._area.left(), self._area.right()
+        self._tick_x = left + (right - left) * np.clip(secs * self._inv_total, 0.0, 1.0)
+        self._tick_labels = [t.strftime("%H:%M") for t in self._ticks]
         self._geom_dirty = False
+        self._recalc_now_x()
+
+    def _recalc_now_x(self):
+        self._now_x = None
+        if self._start and self._end:
+            now = datetime.now()
+            if self._start <= now <= self._end:
+                self._now_x = self._time_to_x(now, self._area.left(), self._area.right())
+
+    def _on_now_tick(self):
+        if not self._show_now_line or not self._start or self._geom_dirty:
+            return
+        prev = self._now_x
+        self._recalc_now_x()
+        if self._now_x != prev:
+            self.update()
 
     def _set_cursor_pointing(self, pointing: bool):
         if self._cursor_pointing != pointing:
@@ -190,11 +336,13 @@ class GanttStrip(QWidget):
         x = event.position().x() if hasattr(event, "position") else float(event.pos().x())
         area = self._area
         if area.contains(QPointF(x, area.center().y())):
-            t = self._x_to_time(x, area.left(), area.right())
+            secs = self._x_to_secs(x, area.left(), area.right())
+            t = None if secs is None else self._start + timedelta(seconds=secs)
             prev_seg = self._hover_seg
+            prev_x = self._hover_x
             self._hover_x = x
             self._hover_t = t
-            seg = self._find_segment_at(t) if t else None
+            seg = self._find_segment_at(secs) if secs is not None else None
             self._hover_seg = seg
             self._set_cursor_pointing(bool(seg))
             if t:
@@ -209,9 +357,10 @@ class GanttStrip(QWidget):
                     gp = event.globalPosition().toPoint() if hasattr(event, "globalPosition") else event.globalPos()
                     QToolTip.showText(gp, text, self)
                     self._tooltip_last = text
-            if seg != prev_seg:
-                self.update()
+            if seg != prev_seg or x != prev_x:
+                self._update_hover_region(prev_seg, prev_x)
         else:
+            prev_seg, prev_x = self._hover_seg, self._hover_x
             self._hover_x = None
             self._hover_t = None
             self._hover_seg = None
@@ -219,9 +368,32 @@ class GanttStrip(QWidget):
             if self._tooltip_last:
                 QToolTip.hideText()
                 self._tooltip_last = ""
-            self.update()
+            self._update_hover_region(prev_seg, prev_x)
         super().mouseMoveEvent(event)
 
+    def _outline_rect(self, seg: Optional[Tuple[datetime, datetime, Optional[str]]]) -> QRectF:
+        if not seg:
+            return QRectF()
+        return self._segment_rect(seg[0], seg[1], self._area, self._bar_y, self._bar_h).adjusted(-3, -3, 3, 3)
+
+    def _cursor_rect(self, x: Optional[float]) -> QRectF:
+        if x is None:
+            return QRectF()
+        return QRectF(x - 2, self._area.top() - 1, 4, self._area.height() + 2)
+
+    def _update_hover_region(self, prev_seg: Optional[Tuple[datetime, datetime, Optional[str]]], prev_x: Optional[float]):
+        rects = []
+        if prev_x != self._hover_x:
+            rects += [self._cursor_rect(prev_x), self._cursor_rect(self._hover_x)]
+        if prev_seg != self._hover_seg:
+            rects += [self._outline_rect(prev_seg), self._outline_rect(self._hover_seg)]
+        dirty = QRegion()
+        for r in rects:
+            if not r.isNull():
+                dirty += r.toAlignedRect()
+        if not dirty.isEmpty():
+            self.update(dirty)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton and self._hover_seg:
             self._selected_seg = self._hover_seg
@@ -230,82 +402,111 @@ class GanttStrip(QWidget):
         super().mousePressEvent(event)
 
     def leaveEvent(self, e):
-        self._hover_x = None
-        self._hover_t = None
-        self._hover_seg = None
-        self._set_cursor_pointing(False)
         if self._tooltip_last:
             QToolTip.hideText()
             self._tooltip_last = ""
-        self.update()
+        if self._hover_x is not None or self._hover_seg is not None:
+            prev_seg, prev_x = self._hover_seg, self._hover_x
+            self._hover_x = None
+            self._hover_t = None
+            self._hover_seg = None
+            self._set_cursor_pointing(False)
+            self._update_hover_region(prev_seg, prev_x)
         super().leaveEvent(e)
 
     def resizeEvent(self, e):
         super().resizeEvent(e)
         self._geom_dirty = True
+        self._static_dirty = True
 
-    def paintEvent(self, _):
-        p = QPainter(self)
+    def _render_static(self, target: QPaintDevice):
+        p = QPainter(target)
         p.setRenderHint(QPainter.Antialiasing, True)
-        colors = theme_colors(self._theme_name)
-        bg = QColor(str(colors["surface"]))
-        text_col = QColor(str(colors["text"]))
-        grid_col = QColor(str(colors["text_alt"]))
-        grid_col.setAlpha(90 if self._theme_name == "light" else 110)
-        p.fillRect(self.rect(), bg)
-        if self._geom_dirty:
-            self._recalc_geometry()
+        p.fillRect(self.rect(), self._bg_color)
         area = self._area
-        p.setPen(QPen(grid_col, 1))
+        p.setPen(self._grid_pen)
         p.drawRect(area)
         if not self._start or not self._end or not self._code:
-            p.setPen(QPen(grid_col, 1))
-            f = QFont(p.font())
-            f.setPointSizeF(max(10.0, f.pointSizeF()))
-            p.setFont(f)
+            p.setFont(self._placeholder_font)
             p.drawText(self.rect(), Qt.AlignCenter, self._placeholder)
             p.end()
             return
         if self._show_axis:
-            step_ticks = self._ticks
-            f_tick = QFont(p.font())
-            f_tick.setPointSizeF(max(9.0, f_tick.pointSizeF() - 1))
-            p.setFont(f_tick)
-            for t in step_ticks:
-                x = self._time_to_x(t, area.left(), area.right())
-                is_major = t.hour in (0, 12)
-                pen = QPen(grid_col, 1.5 if is_major else 1, Qt.DotLine)
-                p.setPen(pen)
-                p.drawLine(x, area.top(), x, area.bottom())
-                p.setPen(QPen(text_col, 1))
-                txt = t.strftime("%H:%M")
-                p.drawText(QRectF(x - 24, self.height() - self._margin_b + 4, 48, self._margin_b - 6), Qt.AlignHCenter | Qt.AlignTop, txt)
-        if self._show_now_line:
-            try:
-                now = datetime.now()
-                if self._start <= now <= self._end:
-                    x_now = self._time_to_x(now, area.left(), area.right())
-                    p.setPen(QPen(QColor(str(colors["primary"])), 1.5))
-                    p.drawLine(x_now, area.top(), x_now, area.bottom())
-            except Exception:
-                pass
+            p.setFont(self._tick_font)
+            minor, major = QPainterPath(), QPainterPath()
+            tick_x = self._tick_x.tolist()
+            for t, x in zip(self._ticks, tick_x):
+                path = major if t.hour in (0, 12) else minor
+                path.moveTo(x, area.top())
+                path.lineTo(x, area.bottom())
+            p.setPen(self._minor_pen)
+            p.drawPath(minor)
+            p.setPen(self._major_pen)
+            p.drawPath(major)
+            p.setPen(self._text_pen)
+            label_y, label_h = self.height() - self._margin_b + 4, self._margin_b - 6
+            for txt, x in zip(self._tick_labels, tick_x):
+                p.drawText(QRectF(x - 24, label_y, 48, label_h), Qt.AlignHCenter | Qt.AlignTop, txt)
         bar_h = self._bar_h
         bar_y = self._bar_y
-        cache_color: dict[Optional[str], QColor] = {}
-        def cstatus(st: Optional[str]) -> QColor:
-            if st not in cache_color:
-                cache_color[st] = self._status_color(st)
-            return cache_color[st]
-        for s, e, st in self._segments:
-            rect = self._segment_rect(s, e, area, bar_y, bar_h)
-            if rect.isNull():
-                continue
-            col = cstatus(st)
-            if col.alpha() == 0:
+        color_lut, fill_lut = self._color_lut, self._fill_lut
+        none_color, none_fill = color_lut[None], fill_lut[None]
+        seg_rects = [self._rect_between(x1, x2, area, bar_y, bar_h) for x1, x2 in self._segments_x(area.left(), area.right()).tolist()]
+        groups: dict[Optional[str], List[QRectF]] = {}
+        for (_, _, st), rect in zip(self._segments, seg_rects):
+            if not rect.isNull():
+                groups.setdefault(st, []).append(rect)
+        p.setPen(Qt.NoPen)
+        for st, rects in groups.items():
+            if color_lut.get(st, none_color).alpha() == 0:
                 continue
-            fill = QColor(col)
-            fill.setAlpha(160 if self._theme_name == "light" else 180)
-            p.fillRect(rect, QBrush(fill))
+            p.setBrush(QBrush(fill_lut.get(st, none_fill)))
+            p.drawRects(rects)
+        p.setBrush(Qt.NoBrush)
+        label_cap = 200
+        if self._show_segment_labels and len(self._segments) <= label_cap:
+            p.setFont(self._label_font)
+            label_pens = self._label_pens
+            none_pen = label_pens[None]
+            for (s, e, st), rect in zip(self._segments, seg_rects):
+                if rect.isNull() or rect.width() < 56:
+                    continue
+                if color_lut.get(st, none_color).alpha() == 0:
+                    continue
+                p.setPen(label_pens.get(st, none_pen))
+                label = (st or "").strip() or f"{s.strftime('%H:%M')} → {e.strftime('%H:%M')}"
+                p.drawText(rect.adjusted(4, 0, -4, 0), Qt.AlignVCenter | Qt.AlignLeft, label)
+        p.end()
+
+    def _invalidate_static(self):
+        self._static_dirty = True
+        self.update()
+
+    def paintEvent(self, event):
+        if self._geom_dirty:
+            self._recalc_geometry()
+            self._static_dirty = True
+        dpr = self.devicePixelRatioF()
+        cache = self._static_cache
+        if self._static_dirty or cache is None or cache.devicePixelRatio() != dpr or cache.size() != self.size() * dpr:
+            cache = QPixmap(self.size() * dpr)
+            cache.setDevicePixelRatio(dpr)
+            self._render_static(cache)
+            self._static_cache = cache
+            self._static_dirty = False
+        dirty = event.region()
+        p = QPainter(self)
+        p.drawPixmap(0, 0, cache)
+        if not self._start or not self._end or not self._code:
+            p.end()
+            return
+        p.setRenderHint(QPainter.Antialiasing, True)
+        area = self._area
+        bar_h = self._bar_h
+        bar_y = self._bar_y
+        if self._show_now_line and self._now_x is not None:
+            p.setPen(self._now_pen)
+            p.drawLine(self._now_x, area.top(), self._now_x, area.bottom())
         def draw_outline(rect: QRectF, color: QColor, width: float, dash: Optional[Tuple[int, int]] = None):
             pen = QPen(color, width)
             if dash:
@@ -318,33 +519,15 @@ class GanttStrip(QWidget):
         if self._selected_seg:
             s, e, st = self._selected_seg
             rect = self._segment_rect(s, e, area, bar_y, bar_h)
-            if not rect.isNull():
-                draw_outline(rect, QColor(str(colors["primary"])), 2.0)
+            if not rect.isNull() and dirty.intersects(rect.toAlignedRect()):
+                draw_outline(rect, self._primary_color, 2.0)
         if self._hover_seg and self._hover_seg != self._selected_seg:
             s, e, st = self._hover_seg
             rect = self._segment_rect(s, e, area, bar_y, bar_h)
-            if not rect.isNull():
-                c = QColor(str(colors["primary"]))
-                c.setAlpha(180)
-                draw_outline(rect, c, 1.5, dash=(4, 3))
-        label_cap = 200
-        if self._show_segment_labels and len(self._segments) <= label_cap:
-            f2 = QFont(p.font())
-            f2.setPointSizeF(max(8.5, f2.pointSizeF() - 1.5))
-            p.setFont(f2)
-            for s, e, st in self._segments:
-                rect = self._segment_rect(s, e, area, bar_y, bar_h)
-                if rect.isNull() or rect.width() < 56:
-                    continue
-                col = cstatus(st)
-                if col.alpha() == 0:
-                    continue
-                txt_color = self._contrast_text_on(col, text_col)
-                p.setPen(QPen(txt_color, 1))
-                label = (st or "").strip() or f"{s.strftime('%H:%M')} → {e.strftime('%H:%M')}"
-                p.drawText(rect.adjusted(4, 0, -4, 0), Qt.AlignVCenter | Qt.AlignLeft, label)
+            if not rect.isNull() and dirty.intersects(rect.toAlignedRect()):
+                draw_outline(rect, self._hover_color, 1.5, dash=(4, 3))
         if self._hover_x is not None:
-            p.setPen(QPen(QColor(str(colors["primary"])), 1))
+            p.setPen(self._cursor_pen)
             p.drawLine(self._hover_x, area.top(), self._hover_x, area.bottom())
         p.end()
 
@@ -355,8 +538,13 @@ class StatusSummaryBar(QWidget):
         self._segments: List[Tuple[datetime, datetime, Optional[str]]] = []
         self._start: Optional[datetime] = None
         self._end: Optional[datetime] = None
+        self._seg_secs = np.zeros((0, 2), dtype=np.float64)
+        self._status_codes = np.zeros(0, dtype=np.int32)
+        self._codes_to_status: List[Optional[str]] = []
         self._rects: List[Tuple[QRectF, Optional[str], float]] = []
+        self._cache_pix: Optional[QPixmap] = None
         self._tooltip_last = ""
+        self._rebuild_luts()
         theme_bus.changed.connect(self._on_theme_changed)
         self.setAttribute(Qt.WA_OpaquePaintEvent, True)
         self.setMouseTracking(True)
@@ -367,36 +555,55 @@ class StatusSummaryBar(QWidget):
 
     def _on_theme_changed(self, name: str, _):
         self._theme_name = name
+        self._rebuild_luts()
+        self._cache_pix = None
         self.update()
 
+    def _rebuild_luts(self):
+        colors = theme_colors(self._theme_name)
+        light = self._theme_name == "light"
+        self._color_lut: dict[Optional[str], QColor] = {k: QColor(str(v)) for k, v in colors["status"].items()}
+        self._color_lut.setdefault(None, QColor(0, 0, 0, 0))
+        self._fill_lut: dict[Optional[str], QColor] = {}
+        for k, c in self._color_lut.items():
+            fill = QColor(c)
+            fill.setAlpha(170 if light else 190)
+            self._fill_lut[k] = fill
+        self._bg_color = QColor(str(colors["surface"]))
+        grid_col = QColor(str(colors["text_alt"]))
+        grid_col.setAlpha(90 if light else 110)
+        self._grid_pen = QPen(grid_col, 1)
+
     def set_segments(self, segments: List[Tuple[datetime, datetime, Optional[str]]], day_start: datetime, day_end: datetime):
         self._segments = segments[:]
         self._start = day_start
         self._end = day_end
+        codes: dict[Optional[str], int] = {}
+        self._status_codes = np.fromiter((codes.setdefault(st, len(codes)) for _, _, st in self._segments), dtype=np.int32, count=len(self._segments))
+        self._codes_to_status = list(codes)
+        self._seg_secs = np.array([((s - day_start).total_seconds(), (e - day_start).total_seconds()) for s, e, _ in self._segments], dtype=np.float64).reshape(-1, 2)
         self._recalc_rects()
         self.update()
 
     def _status_color(self, status: Optional[str]) -> QColor:
-        colors = theme_colors(self._theme_name)
-        hexc = colors["status"].get(status, colors["status"].get(None, "#00000000"))
-        return QColor(str(hexc))
+        lut = self._color_lut
+        return lut.get(status, lut[None])
 
     def _recalc_rects(self):
         self._rects.clear()
+        self._cache_pix = None
         if not self._start or not self._end or not self._segments:
             return
         total = (self._end - self._start).total_seconds()
         if total <= 0:
             return
-        duration_map: dict[Optional[str], float] = {}
-        for s, e, st in self._segments:
-            a = max(s, self._start)
-            b = min(e, self._end)
-            if b > a:
-                duration_map[st] = duration_map.get(st, 0.0) + (b - a).total_seconds()
-        if not duration_map:
+        a = np.clip(self._seg_secs[:, 0], 0.0, total)
+        b = np.clip(self._seg_secs[:, 1], 0.0, total)
+        totals = np.bincount(self._status_codes, weights=(b - a).clip(min=0.0), minlength=len(self._codes_to_status))
+        order = np.argsort(-totals, kind="stable")
+        items = [(self._codes_to_status[i], d) for i, d in zip(order.tolist(), totals[order].tolist()) if d > 0]
+        if not items:
             return
-        items = sorted(duration_map.items(), key=lambda kv: kv[1], reverse=True)
         start_x = 8.0
         end_x = max(start_x + 1.0, self.width() - 8.0)
         w = end_x - start_x
@@ -435,30 +642,29 @@ class StatusSummaryBar(QWidget):
             self._tooltip_last = ""
         super().leaveEvent(e)
 
-    def paintEvent(self, e):
-        p = QPainter(self)
+    def _render_cache(self, target: QPaintDevice):
+        p = QPainter(target)
         p.setRenderHint(QPainter.Antialiasing, True)
-        colors = theme_colors(self._theme_name)
-        bg = QColor(str(colors["surface"]))
-        grid_col = QColor(str(colors["text_alt"]))
-        grid_col.setAlpha(90 if self._theme_name == "light" else 110)
-        p.fillRect(self.rect(), bg)
+        p.fillRect(self.rect(), self._bg_color)
         area = QRectF(8, 8, self.width() - 16, self.height() - 16)
-        p.setPen(QPen(grid_col, 1))
+        p.setPen(self._grid_pen)
         p.drawRect(area)
-        if not self._rects:
-            p.end()
-            return
-        cache_color: dict[Optional[str], QColor] = {}
-        def cstatus(st: Optional[str]) -> QColor:
-            if st not in cache_color:
-                cache_color[st] = self._status_color(st)
-            return cache_color[st]
+        color_lut, fill_lut = self._color_lut, self._fill_lut
+        none_color, none_fill = color_lut[None], fill_lut[None]
         for r, st, pct in self._rects:
-            col = cstatus(st)
-            if col.alpha() == 0:
+            if color_lut.get(st, none_color).alpha() == 0:
                 continue
-            fill = QColor(col)
-            fill.setAlpha(170 if self._theme_name == "light" else 190)
-            p.fillRect(r, QBrush(fill))
+            p.fillRect(r, fill_lut.get(st, none_fill))
+        p.end()
+
+    def paintEvent(self, e):
+        dpr = self.devicePixelRatioF()
+        cache = self._cache_pix
+        if cache is None or cache.devicePixelRatio() != dpr or cache.size() != self.size() * dpr:
+            cache = QPixmap(self.size() * dpr)
+            cache.setDevicePixelRatio(dpr)
+            self._render_cache(cache)
+            self._cache_pix = cache
+        p = QPainter(self)
+        p.drawPixmap(0, 0, cache)
         p.end()
\ No newline at end of file
@@ -1,7 +1,11 @@
 from __future__ import annotations
-from typing import List, Any, Tuple
-from PySide6.QtCore import QObject, Signal, QRunnable
-from e_ui.utils import strip_accents
+import os
+from itertools import chain
+from typing import List, Any, Optional, Tuple
+from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool
+from e_ui.utils import normalize_column, join_fields
+
+_MIN_SHARD = 256
 
 class IndexSignals(QObject):
     finished = Signal(object, tuple, tuple, int)
@@ -18,20 +22,66 @@ class IndexTask(QRunnable):
         self.token = token
         self.signals = signals
 
+    def _column(self, c: int) -> List[str]:
+        vals = ["" if r[c] is None else str(r[c]) for r in self.rows]
+        return normalize_column(vals, self.case_sensitive, self.ignore_accents)
+
     def run(self):
         try:
-            out: List[List[str]] = []
-            for r in self.rows:
-                fields: List[str] = []
-                for c in self.cols:
-                    v = r[c] if c < len(r) else ""
-                    s = v if isinstance(v, str) else ("" if v is None else str(v))
-                    if not self.case_sensitive:
-                        s = s.lower()
-                    if self.ignore_accents:
-                        s = strip_accents(s)
-                    fields.append(s)
-                out.append(fields)
-            self.signals.finished.emit(out, self.cols, (self.case_sensitive, self.ignore_accents), self.token)
+            cols = [self._column(c) for c in self.cols]
+            out: List[List[str]] = list(map(list, zip(*cols))) if cols else [[] for _ in self.rows]
+            joined = list(map(join_fields, out))
+            self.signals.finished.emit((out, joined), self.cols, (self.case_sensitive, self.ignore_accents), self.token)
         except Exception as ex:
-            self.signals.error.emit(str(ex), self.token)
\ No newline at end of file
+            self.signals.error.emit(str(ex), self.token)
+
+class IndexCoordinator(QObject):
+    def __init__(self, signals: IndexSignals, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.signals = signals
+        self._shard_signals = IndexSignals(self)
+        self._shard_signals.finished.connect(self._on_shard_done)
+        self._shard_signals.error.connect(self._on_shard_error)
+        self._partials: List[Optional[Tuple[List[List[str]], List[str]]]] = []
+        self._pending = 0
+        self._outstanding = 0
+        self._token = 0
+        self._cols: Tuple[int, ...] = ()
+        self._flags: Tuple[bool, bool] = (False, False)
+
+    def start(self, pool: QThreadPool, rows: List[List[Any]], cols: Tuple[int, ...],
+              case_sensitive: bool, ignore_accents: bool, token: int):
+        chunk = max(_MIN_SHARD, -(-len(rows) // (os.cpu_count() or 1)))
+        starts = range(0, max(1, len(rows)), chunk)
+        self._partials = [None] * len(starts)
+        self._pending = self._outstanding = len(starts)
+        self._token = token
+        self._cols = cols
+        self._flags = (case_sensitive, ignore_accents)
+        for shard, lo in enumerate(starts):
+            pool.start(IndexTask(rows[lo:lo + chunk], cols, case_sensitive, ignore_accents, shard, self._shard_signals))
+
+    def _shard_returned(self):
+        self._outstanding -= 1
+        if self._outstanding == 0:
+            self.deleteLater()
+
+    def _on_shard_done(self, part: object, _cols: tuple, _flags: tuple, shard: int):
+        self._shard_returned()
+        if self._pending <= 0:
+            return
+        self._partials[shard] = part
+        self._pending -= 1
+        if self._pending == 0:
+            out = list(chain.from_iterable(p[0] for p in self._partials))
+            joined = list(chain.from_iterable(p[1] for p in self._partials))
+            self._partials = []
+            self.signals.finished.emit((out, joined), self._cols, self._flags, self._token)
+
+    def _on_shard_error(self, msg: str, _shard: int):
+        self._shard_returned()
+        if self._pending <= 0:
+            return
+        self._pending = 0
+        self._partials = []
+        self.signals.error.emit(msg, self._token)
\ No newline at end of file
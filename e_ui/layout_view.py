@@ -3,13 +3,30 @@ from typing import Dict, Optional, List, Any, cast, Tuple
 from datetime import datetime, timezone
 from pathlib import Path
 import json
+import math
 import asyncio
-from PySide6.QtCore import Qt, QPointF, Signal, QRectF
-from PySide6.QtGui import QBrush, QColor, QPen, QPainter
-from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsItemGroup, QGraphicsItem, QMenu, QStyleFactory, QGraphicsColorizeEffect, QGraphicsSimpleTextItem
+from PySide6.QtCore import Qt, QEvent, QPointF, QTimer, Signal, QRectF
+from PySide6.QtGui import QBrush, QColor, QPen, QPainter, QPixmap
+from PySide6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem, QGraphicsItemGroup, QGraphicsItem, QGraphicsPixmapItem, QMenu, QStyleFactory, QGraphicsColorizeEffect, QGraphicsSimpleTextItem, QToolTip
+from PySide6.QtSvg import QSvgRenderer
 from PySide6.QtSvgWidgets import QGraphicsSvgItem
 from qasync import asyncSlot
 from e_ui.theme import THEMES, ThemeColors, ThemeStatusMap
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_LAYOUT_CACHE: Dict[Tuple[str, float], dict] = {}
+
+def _read_layout(p: Path) -> dict:
+    if not p.exists():
+        return {}
+    key = (str(p.resolve()), p.stat().st_mtime)
+    data = _LAYOUT_CACHE.get(key)
+    if data is None:
+        data = _LAYOUT_CACHE[key] = orjson.loads(p.read_bytes()) if orjson else json.loads(p.read_text(encoding="utf-8"))
+    return data
 
 def _normalize_dt(dt: Optional[datetime]) -> Optional[datetime]:
     if dt is None:
@@ -18,13 +35,20 @@ def _normalize_dt(dt: Optional[datetime]) -> Optional[datetime]:
         return dt.astimezone(timezone.utc).replace(tzinfo=None)
     return dt
 
+def _to_datetime(v: Any) -> Optional[datetime]:
+    if isinstance(v, datetime):
+        return _normalize_dt(v)
+    try:
+        return _normalize_dt(datetime.fromisoformat(v))
+    except Exception:
+        return None
+
 def _fmt_relative(dt: Optional[datetime]) -> str:
     dt = _normalize_dt(dt)
     if not dt:
         return "-"
     try:
-        now = datetime.now()
-        s = int((now - dt).total_seconds())
+        s = int((datetime.now() - dt).total_seconds())
         if s < 60:
             return f"{s}s ago"
         m = s // 60
@@ -38,15 +62,66 @@ def _fmt_relative(dt: Optional[datetime]) -> str:
     except Exception:
         return "-"
 
+_SCALE_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0)
+
+_DPR_EVENTS = tuple(getattr(QEvent, n) for n in ("DevicePixelRatioChange", "ScreenChangeInternal") if hasattr(QEvent, n))
+
+def _scale_bucket(scale: float) -> float:
+    return next((b for b in _SCALE_BUCKETS if b >= scale), _SCALE_BUCKETS[-1])
+
+_SVG_RENDERERS: Dict[str, QSvgRenderer] = {}
+
+def _svg_renderer(path: str) -> QSvgRenderer:
+    r = _SVG_RENDERERS.get(path)
+    if r is None:
+        r = _SVG_RENDERERS[path] = QSvgRenderer(path)
+    return r
+
+class SvgPixmapCache:
+    def __init__(self) -> None:
+        self._pixmaps: Dict[Tuple[str, float, float], QPixmap] = {}
+
+    def get(self, path: str, dpr: float, bucket: float) -> QPixmap:
+        key = (path, dpr, bucket)
+        pix = self._pixmaps.get(key)
+        if pix is None:
+            r = _svg_renderer(path)
+            size = r.defaultSize()
+            if not r.isValid() or size.isEmpty():
+                pix = QPixmap()
+            else:
+                f = dpr * bucket
+                pix = QPixmap(max(1, round(size.width() * f)), max(1, round(size.height() * f)))
+                pix.fill(Qt.transparent)
+                p = QPainter(pix)
+                p.setRenderHint(QPainter.Antialiasing, True)
+                r.render(p)
+                p.end()
+                pix.setDevicePixelRatio(f)
+            self._pixmaps[key] = pix
+        return pix
+
+_SVG_PIXMAPS = SvgPixmapCache()
+_BRUSHES: Dict[int, QBrush] = {}
+
+def _brush_for(color: QColor) -> QBrush:
+    key = color.rgba()
+    b = _BRUSHES.get(key)
+    if b is None:
+        b = _BRUSHES[key] = QBrush(color)
+    return b
+
 class DeviceGroup(QGraphicsItemGroup):
-    def __init__(self, path: str, code: str, name: str) -> None:
+    def __init__(self, path: str, code: str, name: str, dpr: float = 1.0, bucket: float = 1.0) -> None:
         super().__init__()
         self.code = code
         self.name = name
+        self.path = path
+        self.scene_rect = QRectF()
         self.current_status: Optional[str] = None
         self.latest_time: Optional[datetime] = None
-        self.svg_item = QGraphicsSvgItem(path)
-        self.svg_item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        self.svg_item = QGraphicsPixmapItem(_SVG_PIXMAPS.get(path, dpr, bucket))
+        self.svg_item.setTransformationMode(Qt.SmoothTransformation)
         rect = self.svg_item.boundingRect()
         if rect.isEmpty():
             rect = QRectF(0, 0, 64, 64)
@@ -79,16 +154,22 @@ class DeviceGroup(QGraphicsItemGroup):
         self.current_theme = "light"
         self._status_color_func = None
         self._text_color = QColor("black")
-        self._update_tooltip()
+        self._iso_cache: Optional[str] = None
+        self._color: Optional[QColor] = None
+        self._last_input_key: Optional[Tuple[Optional[int], int, str]] = None
+
+    def set_scale_bucket(self, dpr: float, bucket: float) -> None:
+        self.svg_item.setPixmap(_SVG_PIXMAPS.get(self.path, dpr, bucket))
 
     def _lighter(self, c: QColor, factor: int = 160) -> QColor:
         return c.lighter(factor)
 
-    def _update_tooltip(self):
+    def tooltip_text(self) -> str:
         st = self.current_status or "Unknown"
-        iso = self.latest_time.isoformat() if self.latest_time else "-"
+        if self._iso_cache is None:
+            self._iso_cache = self.latest_time.isoformat() if self.latest_time else "-"
         rel = _fmt_relative(self.latest_time)
-        self.setToolTip(f"{self.code} • {self.name}\nStatus: {st}\nUpdated: {iso} ({rel})\nDouble-click: reset view\nRight-click: actions")
+        return f"{self.code} • {self.name}\nStatus: {st}\nUpdated: {self._iso_cache} ({rel})\nDouble-click: reset view\nRight-click: actions"
 
     def _update_border(self, hovered: bool = False):
         pen = QPen(Qt.NoPen)
@@ -116,20 +197,19 @@ class DeviceGroup(QGraphicsItemGroup):
     def update_status(self, status: Optional[str], color: Optional[QColor], latest_time: Optional[datetime]) -> None:
         norm_time = _normalize_dt(latest_time)
         changed = (status != self.current_status) or (norm_time != self.latest_time)
-        if not changed:
+        if not changed and color is self._color:
             return
         self.current_status = status
+        if norm_time != self.latest_time:
+            self._iso_cache = None
         self.latest_time = norm_time
-        if color and isinstance(color, QColor) and color.isValid():
-            prev_brush = self.box_item.brush()
-            prev = prev_brush.color() if prev_brush.style() != Qt.NoBrush else None
-            if not prev or prev != color:
-                self.box_item.setBrush(QBrush(color))
-        else:
-            if self.box_item.brush().style() != Qt.NoBrush:
+        if color is not self._color:
+            self._color = color
+            if color and isinstance(color, QColor) and color.isValid():
+                self.box_item.setBrush(_brush_for(color))
+            elif self.box_item.brush().style() != Qt.NoBrush:
                 self.box_item.setBrush(Qt.NoBrush)
         self._update_border(hovered=False)
-        self._update_tooltip()
 
     def set_theme(self, theme: str, status_color_func, text_color: Optional[QColor] = None) -> None:
         self.current_theme = theme
@@ -139,9 +219,19 @@ class DeviceGroup(QGraphicsItemGroup):
         color = status_color_func(self.current_status) if status_color_func else None
         self.update_status(self.current_status, color, self.latest_time)
 
-    def update_input_count(self, count: Optional[int], text_color: Optional[QColor] = None) -> None:
+    def hit_rect(self) -> QRectF:
+        rect = self.box_item.rect()
+        if self.badge_bg.isVisible():
+            rect = rect.united(self.badge_bg.rect())
+        return self.mapRectToScene(rect)
+
+    def update_input_count(self, count: Optional[int], text_color: Optional[QColor] = None) -> bool:
         if text_color is not None:
             self._text_color = text_color
+        key = (count, self._text_color.rgba(), self.current_theme)
+        if key == self._last_input_key:
+            return False
+        self._last_input_key = key
         if count and count > 0:
             self.text_item.setText(str(count))
             self.text_item.setBrush(QBrush(self._text_color))
@@ -161,6 +251,7 @@ class DeviceGroup(QGraphicsItemGroup):
         else:
             self.text_item.setVisible(False)
             self.badge_bg.setVisible(False)
+        return True
 
 class LayoutView(QGraphicsView):
     requestStatus = Signal(str)
@@ -171,6 +262,7 @@ class LayoutView(QGraphicsView):
     syncScaleRequested = Signal(float)
     MIN_SCALE = 0.2
     MAX_SCALE = 5.0
+    GRID_CELL = 128.0
 
     def __init__(self, layout_json: str, tab_filter: str, status_service, theme: str) -> None:
         super().__init__()
@@ -178,66 +270,69 @@ class LayoutView(QGraphicsView):
         self.tab_filter = tab_filter
         self.theme = theme.lower()
         self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
         self.setScene(self._scene)
         self.devices: Dict[str, DeviceGroup] = {}
         self.bg_item: Optional[QGraphicsSvgItem] = None
+        self._grid: Dict[Tuple[int, int], List[Tuple[QRectF, DeviceGroup]]] = {}
+        self._grid_cells: Dict[str, List[Tuple[int, int]]] = {}
+        self._path_cache: Dict[Tuple[str, str, Optional[str]], str] = {}
         self._current_scale = 1.0
+        self._scale_bucket = 1.0
+        self._dpr = 1.0
+        self._status_color_cache: Dict[Tuple[str, Optional[str]], QColor] = {}
+        self._text_color_cache: Dict[str, QColor] = {}
         self.setRenderHints(self.renderHints() | QPainter.Antialiasing | QPainter.SmoothPixmapTransform | QPainter.TextAntialiasing)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
         self.setDragMode(QGraphicsView.NoDrag)
         self.setMouseTracking(True)
-        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(30)
+        self._sync_timer.timeout.connect(lambda: self.syncScaleRequested.emit(self._current_scale))
+        self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
+        self.setOptimizationFlag(QGraphicsView.DontAdjustForAntialiasing, True)
         self._load_layout(layout_json)
 
     def _status_color(self, v: Optional[str]) -> QColor:
-        colors = cast(ThemeColors, THEMES.get(self.theme, THEMES["light"]))
-        status_map = cast(ThemeStatusMap, colors["status"])
-        return QColor(status_map.get(v, status_map.get(None, "#80808040")))
+        key = (self.theme, v)
+        c = self._status_color_cache.get(key)
+        if c is None:
+            colors = cast(ThemeColors, THEMES.get(self.theme, THEMES["light"]))
+            status_map = cast(ThemeStatusMap, colors["status"])
+            c = self._status_color_cache[key] = QColor(status_map.get(v, status_map.get(None, "#80808040")))
+        return c
 
     def _text_color(self) -> QColor:
-        colors = THEMES.get(self.theme, THEMES["light"])
-        return QColor(colors["text"])
-
-    def _to_datetime(self, v) -> Optional[datetime]:
-        if isinstance(v, datetime):
-            return _normalize_dt(v)
-        if isinstance(v, str):
-            try:
-                dt = datetime.fromisoformat(v)
-                return _normalize_dt(dt)
-            except Exception:
-                return None
-        return None
+        c = self._text_color_cache.get(self.theme)
+        if c is None:
+            colors = THEMES.get(self.theme, THEMES["light"])
+            c = self._text_color_cache[self.theme] = QColor(colors["text"])
+        return c
 
     def _build_status_map(self, rows: List[Dict[str, Any]]) -> Dict[str, Tuple[Optional[str], Optional[datetime]]]:
-        m: Dict[str, Tuple[Optional[str], Optional[datetime]]]= {}
-        for r in rows:
-            code = r.get("equip_code")
-            if not code:
-                continue
-            status_code = r.get("equip_status")
-            dt = self._to_datetime(r.get("as_of") or r.get("event_time"))
-            m[code] = (status_code, dt)
-        return m
+        to_dt = _to_datetime
+        return {code: (r.get("equip_status"), to_dt(r.get("as_of") or r.get("event_time"))) for r in rows if (code := r.get("equip_code"))}
 
     @asyncSlot()
     async def refresh_devices(self) -> None:
         try:
             codes = list(self.devices.keys())
             rows = await self.service.get_latest(codes)
-            status_map = self._build_status_map(rows)
-            for dev in self.devices.values():
-                status_code, dt = status_map.get(dev.code, (None, None))
-                dev.update_status(status_code, self._status_color(status_code), dt)
+            self._apply_status_map(self._build_status_map(rows))
         except asyncio.CancelledError:
             return
 
     def apply_hot_data(self, status_rows: List[Dict[str, Any]]):
-        status_map = self._build_status_map(status_rows)
+        self._apply_status_map(self._build_status_map(status_rows))
+
+    def _apply_status_map(self, status_map: Dict[str, Tuple[Optional[str], Optional[datetime]]]):
+        color_for = {s: self._status_color(s) for s in {s for s, _ in status_map.values()} | {None}}
         for dev in self.devices.values():
             status_code, dt = status_map.get(dev.code, (None, None))
-            dev.update_status(status_code, self._status_color(status_code), dt)
+            dev.update_status(status_code, color_for[status_code], dt)
 
     def apply_input_data(self, input_rows: List[Dict[str, Any]]):
         input_map: Dict[str, Optional[int]] = {}
@@ -250,40 +345,52 @@ class LayoutView(QGraphicsView):
         txt = self._text_color()
         for dev in self.devices.values():
             count = input_map.get(dev.code)
-            dev.update_input_count(int(count) if count is not None else None, txt)
+            if dev.update_input_count(int(count) if count is not None else None, txt):
+                self._add_to_grid(dev)
 
     def _load_layout(self, layout_json: str) -> None:
         p = Path(layout_json)
         base_dir = p.parent if p.parent.exists() else Path.cwd()
         colors = THEMES.get(self.theme, THEMES["light"])
         self.setBackgroundBrush(QBrush(QColor(colors["surface"])))
-        data: dict = json.loads(p.read_text(encoding="utf-8")) if p.exists() else {}
+        data = _read_layout(p)
         floor = data.get("floors", {}).get(self.tab_filter, {}) if data else {}
         self._load_background(base_dir, floor.get("background"))
         if self._scene.sceneRect().isEmpty():
             self._scene.setSceneRect(0, 0, 1600, 900)
         items = floor.get("devices") or floor.get("items") or []
+        prev_idx = self._scene.itemIndexMethod()
+        self._scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self.setUpdatesEnabled(False)
+        self._dpr = self.devicePixelRatioF()
         for it in items:
             code = str(it.get("code") or it.get("equip_code") or it.get("id") or "")
             name = str(it.get("name") or it.get("label") or code)
             img_decl = str(it.get("image") or f"{code}.svg")
             img_path = self._resolve_path(base_dir / "devices", img_decl, fallback=f"{code}.svg")
-            dev = DeviceGroup(img_path, code, name)
+            dev = DeviceGroup(img_path, code, name, self._dpr, self._scale_bucket)
             dev.set_theme(self.theme, self._status_color, self._text_color())
             x = float(it.get("x") or (it.get("pos") or {}).get("x") or 0)
             y = float(it.get("y") or (it.get("pos") or {}).get("y") or 0)
             dev.setPos(QPointF(x, y))
+            dev.scene_rect = dev.mapRectToScene(dev.childrenBoundingRect())
             self._scene.addItem(dev)
             self.devices[code] = dev
+            self._add_to_grid(dev)
+        self._scene.setItemIndexMethod(prev_idx)
+        self.setUpdatesEnabled(True)
+        self._scene.setBspTreeDepth(max(6, int(math.log2(max(2, len(self.devices)))) + 3))
         self.fitInView(self._scene.sceneRect(), Qt.KeepAspectRatio)
         self._current_scale = self.transform().m11()
+        self._sync_scale_bucket()
 
     def _load_background(self, base_dir: Path, bg_file: Optional[str]) -> None:
         if not bg_file:
             return
         path = self._resolve_path(base_dir, bg_file)
         if path:
-            bg = QGraphicsSvgItem(path)
+            bg = QGraphicsSvgItem()
+            bg.setSharedRenderer(_svg_renderer(path))
             bg.setZValue(0.0)
             bg.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
             self.bg_item = bg
@@ -291,6 +398,13 @@ class LayoutView(QGraphicsView):
             self._scene.setSceneRect(bg.boundingRect())
 
     def _resolve_path(self, base_dir: Path, rel_or_abs: str, fallback: Optional[str] = None) -> str:
+        key = (str(base_dir), rel_or_abs, fallback)
+        hit = self._path_cache.get(key)
+        if hit is None:
+            hit = self._path_cache[key] = self._find_path(base_dir, rel_or_abs, fallback)
+        return hit
+
+    def _find_path(self, base_dir: Path, rel_or_abs: str, fallback: Optional[str]) -> str:
         q = Path(rel_or_abs)
         candidates = [q, Path("e_ui/assets/layout") / q, Path("e_ui/assets/devices") / q, base_dir / q]
         if fallback:
@@ -301,10 +415,59 @@ class LayoutView(QGraphicsView):
                 return str(c.resolve())
         return ""
 
+    def _add_to_grid(self, dev: DeviceGroup) -> None:
+        for key in self._grid_cells.pop(dev.code, ()):
+            self._grid[key] = [e for e in self._grid[key] if e[1] is not dev]
+        rect = dev.hit_rect()
+        cell = self.GRID_CELL
+        cells = [(cx, cy) for cx in range(int(rect.left() // cell), int(rect.right() // cell) + 1)
+                 for cy in range(int(rect.top() // cell), int(rect.bottom() // cell) + 1)]
+        for key in cells:
+            self._grid.setdefault(key, []).append((rect, dev))
+        self._grid_cells[dev.code] = cells
+
+    def _sync_scale_bucket(self) -> None:
+        bucket = _scale_bucket(self._current_scale)
+        dpr = self.devicePixelRatioF()
+        if bucket == self._scale_bucket and dpr == self._dpr:
+            return
+        self._scale_bucket = bucket
+        self._dpr = dpr
+        for dev in self.devices.values():
+            dev.set_scale_bucket(dpr, bucket)
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() in _DPR_EVENTS:
+            self._sync_scale_bucket()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._sync_scale_bucket()
+
+    def _pick_device(self, scene_pos: QPointF) -> Optional[DeviceGroup]:
+        cell = self.GRID_CELL
+        bucket = self._grid.get((int(scene_pos.x() // cell), int(scene_pos.y() // cell)))
+        if not bucket:
+            return None
+        for rect, dev in reversed(bucket):
+            if rect.contains(scene_pos):
+                return dev
+        return None
+
+    def viewportEvent(self, event) -> bool:
+        if event.type() == QEvent.ToolTip:
+            dev = self._pick_device(self.mapToScene(event.pos()))
+            if dev:
+                QToolTip.showText(event.globalPos(), dev.tooltip_text(), self.viewport())
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+        return super().viewportEvent(event)
+
     def mouseMoveEvent(self, event):
-        sp = self.mapToScene(event.pos())
-        items = self._scene.items(QRectF(sp.x() - 1, sp.y() - 1, 2, 2))
-        self.setCursor(Qt.PointingHandCursor if any(isinstance(it, DeviceGroup) for it in items) else Qt.ArrowCursor)
+        self.setCursor(Qt.PointingHandCursor if self._pick_device(self.mapToScene(event.pos())) else Qt.ArrowCursor)
         super().mouseMoveEvent(event)
 
     def mouseDoubleClickEvent(self, event) -> None:
@@ -315,12 +478,11 @@ class LayoutView(QGraphicsView):
     def reset_view(self) -> None:
         self.fitInView(self._scene.sceneRect(), Qt.KeepAspectRatio)
         self._current_scale = self.transform().m11()
+        self._sync_scale_bucket()
 
     def mousePressEvent(self, event) -> None:
         if event.button() == Qt.LeftButton:
-            sp = self.mapToScene(event.pos())
-            items = self._scene.items(QRectF(sp.x() - 2, sp.y() - 2, 4, 4))
-            target: Optional[DeviceGroup] = next((it for it in items if isinstance(it, DeviceGroup)), None)
+            target = self._pick_device(self.mapToScene(event.pos()))
             if target:
                 for dev in self.devices.values():
                     dev.setSelected(False)
@@ -338,9 +500,7 @@ class LayoutView(QGraphicsView):
         super().mouseReleaseEvent(event)
 
     def contextMenuEvent(self, event):
-        sp = self.mapToScene(event.pos())
-        items = self._scene.items(QRectF(sp.x() - 2, sp.y() - 2, 4, 4))
-        target: Optional[DeviceGroup] = next((it for it in items if isinstance(it, DeviceGroup)), None)
+        target = self._pick_device(self.mapToScene(event.pos()))
         if target:
             self._show_device_menu(target, event.globalPos())
 
@@ -371,31 +531,39 @@ class LayoutView(QGraphicsView):
         factor = new_scale / self._current_scale
         self.scale(factor, factor)
         self._current_scale = new_scale
-        self.syncScaleRequested.emit(self._current_scale)
+        self._sync_scale_bucket()
+        self._sync_timer.start()
 
     def apply_scale(self, scale_value: float) -> None:
         scale_value = max(self.MIN_SCALE, min(self.MAX_SCALE, scale_value))
         self.resetTransform()
         self.scale(scale_value, scale_value)
         self._current_scale = scale_value
+        self._sync_scale_bucket()
 
     def fit_all(self) -> None:
         self.fitInView(self._scene.sceneRect(), Qt.KeepAspectRatio)
         self._current_scale = self.transform().m11()
+        self._sync_scale_bucket()
 
     def fit_selected(self) -> None:
         sel = [it for it in self.devices.values() if it.isSelected()]
         if not sel:
             self.fit_all()
             return
-        rect = sel[0].mapToScene(sel[0].childrenBoundingRect()).boundingRect()
+        rect = QRectF(sel[0].scene_rect)
         for it in sel[1:]:
-            rect = rect.united(it.mapToScene(it.childrenBoundingRect()).boundingRect())
+            rect = rect.united(it.scene_rect)
         if rect.isValid() and not rect.isEmpty():
             self.fitInView(rect.adjusted(-20, -20, 20, 20), Qt.KeepAspectRatio)
             self._current_scale = self.transform().m11()
+            self._sync_scale_bucket()
 
     def set_theme(self, theme: str) -> None:
+        tr = self.transform()
+        center = self.mapToScene(self.viewport().rect().center())
+        self._status_color_cache.clear()
+        self._text_color_cache.clear()
         self.theme = theme.lower()
         colors = THEMES.get(self.theme, THEMES["light"])
         self.setBackgroundBrush(QBrush(QColor(colors["surface"])))
@@ -408,4 +576,5 @@ class LayoutView(QGraphicsView):
                 self.bg_item.setGraphicsEffect(eff)
             else:
                 self.bg_item.setGraphicsEffect(None)
-        self.fit_all()
\ No newline at end of file
+        self.setTransform(tr)
+        self.centerOn(center)
\ No newline at end of file
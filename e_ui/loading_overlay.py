@@ -1,6 +1,7 @@
 from __future__ import annotations
-from PySide6.QtCore import Qt, QTimer, QSize
-from PySide6.QtGui import QPainter, QColor, QPen
+from typing import List, Optional
+from PySide6.QtCore import Qt, QEvent, QTimer, QSize, QPointF
+from PySide6.QtGui import QPainter, QColor, QPen, QPixmap
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
 class Spinner(QWidget):
@@ -15,11 +16,55 @@ class Spinner(QWidget):
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._tick)
         self._interval_ms = 80
-        self._timer.start(self._interval_ms)
         self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
         self.setFixedSize(QSize(size, size))
+        self._pens: List[QPen] = []
+        self._sprite: Optional[QPixmap] = None
+        self._rebuild_pens()
+
+    def _rebuild_pens(self):
+        color = self.palette().highlight().color()
+        self._pens = []
+        for i in range(self._count):
+            c = QColor(color)
+            c.setAlpha(int(255 * (i + 1) / self._count))
+            self._pens.append(QPen(c, self._w, Qt.SolidLine, Qt.RoundCap))
+        self._sprite = None
+
+    def _render_sprite(self, dpr: float) -> QPixmap:
+        sprite = QPixmap(QSize(self._size, self._size) * dpr)
+        sprite.setDevicePixelRatio(dpr)
+        sprite.fill(Qt.transparent)
+        p = QPainter(sprite)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        p.translate(self._size / 2, self._size / 2)
+        radius = self._size // 2 - self._len - 2
+        angle = 360 / self._count
+        for pen in self._pens:
+            p.setPen(pen)
+            p.drawLine(0, -radius, 0, -(radius + self._len))
+            p.rotate(angle)
+        p.end()
+        return sprite
+
+    def changeEvent(self, e):
+        if e.type() == QEvent.PaletteChange:
+            self._rebuild_pens()
+            self.update()
+        super().changeEvent(e)
+
+    def showEvent(self, e):
+        self.start()
+        super().showEvent(e)
+
+    def hideEvent(self, e):
+        self._timer.stop()
+        super().hideEvent(e)
 
     def _tick(self):
+        if not self.isVisible():
+            self._timer.stop()
+            return
         self._step = (self._step + 1) % self._count
         self.update()
 
@@ -33,19 +78,14 @@ class Spinner(QWidget):
         self.update()
 
     def paintEvent(self, _):
+        dpr = self.devicePixelRatioF()
+        if self._sprite is None or self._sprite.devicePixelRatio() != dpr:
+            self._sprite = self._render_sprite(dpr)
         p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
+        p.setRenderHint(QPainter.SmoothPixmapTransform, True)
         p.translate(self.width() / 2, self.height() / 2)
-        color = self.palette().highlight().color()
-        radius = min(self.width(), self.height()) // 2 - self._len - 2
-        for i in range(self._count):
-            alpha = int(255 * (i + 1) / self._count)
-            c = QColor(color)
-            c.setAlpha(alpha)
-            pen = QPen(c, self._w, Qt.SolidLine, Qt.RoundCap)
-            p.setPen(pen)
-            p.drawLine(0, -radius, 0, -(radius + self._len))
-            p.rotate(360 / self._count)
+        p.rotate(self._step * 360 / self._count)
+        p.drawPixmap(QPointF(-self._size / 2, -self._size / 2), self._sprite)
         p.end()
 
 class LoadingOverlay(QWidget):
@@ -1,13 +1,14 @@
 from __future__ import annotations
 import getpass, os
+from functools import lru_cache, partial
 from datetime import datetime, timedelta, timezone
 import json
 import asyncio
 import time
-from pathlib import Path
 from dataclasses import replace, dataclass
 from typing import cast, List, Dict, Any, Optional
-from PySide6.QtCore import Qt, QTimer, QSettings
+import numpy as np
+from PySide6.QtCore import Qt, QEvent, QTimer, QSettings
 from PySide6.QtGui import QAction, QKeySequence
 from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QToolButton, QMenu, QWidget, QHBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QVBoxLayout, QDialog, QLabel, QStatusBar, QStyleFactory, QWidgetAction, QComboBox, QSplitter
 from qasync import asyncSlot
@@ -15,23 +16,39 @@ from a_core.configs.config import AppConfig, Theme
 from d_application.services.full_service import FullLoaderService
 from d_application.services.load_controller import LoadController
 from e_ui.layout_view import LayoutView
-from e_ui.dialogs import BaseTableDialog, StatusDialog, WipDialog, EipDialog, InputDialog
+from e_ui.dialogs import BaseTableDialog, StatusDialog, WipDialog, EipDialog, InputDialog, rows_to_matrix, STATUS_KEYS, INPUT_KEYS
 from e_ui.gantt import GanttStrip, StatusSummaryBar
 from e_ui.theme import apply_theme, THEMES, apply_mica
 
 def load_layout_codes(layout_path: str) -> list[str]:
-    p = Path(layout_path)
-    data = json.loads(p.read_text(encoding="utf-8"))
-    codes: list[str] = []
-    for floor in (data.get("floors") or {}).values():
-        items = floor.get("items", []) or floor.get("devices", [])
-        for item in items:
-            code = str(item.get("id") or item.get("equip_code") or item.get("code") or "")
-            if code:
-                codes.append(code)
-    return sorted(list(dict.fromkeys(codes)))
+    with open(layout_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    def gen():
+        for floor in (data.get("floors") or {}).values():
+            for item in floor.get("items", []) or floor.get("devices", []):
+                code = str(item.get("id") or item.get("equip_code") or item.get("code") or "")
+                if code:
+                    yield code
+    return sorted(dict.fromkeys(gen()))
+
+@lru_cache(maxsize=4096)
+def _parse_dt_str(v: str) -> Optional[datetime]:
+    try:
+        dt = datetime.fromisoformat(v)
+    except ValueError:
+        try:
+            dt = datetime.strptime(v, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
 
 def _hex_to_rgba_str(s: str, alpha: float) -> str:
+    return _hex_to_rgba_cached(s, round(alpha, 3))
+
+@lru_cache(maxsize=128)
+def _hex_to_rgba_cached(s: str, alpha: float) -> str:
     s = s.strip()
     if s.startswith("#"):
         s = s[1:]
@@ -45,6 +62,8 @@ def _hex_to_rgba_str(s: str, alpha: float) -> str:
     a = max(0.0, min(1.0, alpha))
     return f"rgba({r},{g},{b},{a:.3f})"
 
+_PALETTE_ACTIONS = (("status", "📊 Status"), ("wip", "📦 WIP"), ("eip", "🌐 EIP"), ("input", "📥 Input"))
+
 class CommandPalette(QDialog):
     def __init__(self, parent: QMainWindow, codes: list[str], handler) -> None:
         super().__init__(parent)
@@ -58,21 +77,28 @@ class CommandPalette(QDialog):
         self.search.setPlaceholderText("Type equipment code or action… (e.g. 'status ABC123')")
         self.list_widget = QListWidget(self)
         self.list_widget.setAlternatingRowColors(True)
+        lw = self.list_widget
+        lw.setUniformItemSizes(True)
+        lw.setSortingEnabled(False)
+        lw.setUpdatesEnabled(False)
+        lw.blockSignals(True)
+        self._items: list[QListWidgetItem] = []
         for code in codes:
-            self._add_item("status", "📊 Status", code)
-            self._add_item("wip", "📦 WIP", code)
-            self._add_item("eip", "🌐 EIP", code)
-            self._add_item("input", "📥 Input", code)
+            for act, label in _PALETTE_ACTIONS:
+                it = QListWidgetItem(f"{label} {code}")
+                it.setData(Qt.UserRole, (act, code))
+                lw.addItem(it)
+                self._items.append(it)
+        lw.blockSignals(False)
+        lw.setUpdatesEnabled(True)
+        self._lc = [it.text().lower() for it in self._items]
+        self._vis = [True] * len(self._items)
         lay.addWidget(self.search)
         lay.addWidget(self.list_widget)
         self.search.textChanged.connect(self._filter)
         self.search.returnPressed.connect(self._activate_current)
         self.list_widget.itemActivated.connect(self._select)
 
-    def _add_item(self, act: str, label: str, code: str):
-        it = QListWidgetItem(f"{label} {code}", self.list_widget)
-        it.setData(Qt.UserRole, (act, code))
-
     def showEvent(self, e):
         super().showEvent(e)
         self.search.setFocus()
@@ -86,22 +112,25 @@ class CommandPalette(QDialog):
 
     def _filter(self, text: str):
         t = text.lower().strip()
-        first_visible_row = -1
-        for i in range(self.list_widget.count()):
-            it = self.list_widget.item(i)
-            is_vis = (t in it.text().lower()) if t else True
-            it.setHidden(not is_vis)
-            if is_vis and first_visible_row < 0:
-                first_visible_row = i
-        if first_visible_row >= 0:
-            self.list_widget.setCurrentRow(first_visible_row)
+        vis = [t in s for s in self._lc] if t else [True] * len(self._lc)
+        lw = self.list_widget
+        lw.setUpdatesEnabled(False)
+        lw.blockSignals(True)
+        try:
+            for it, old, new in zip(self._items, self._vis, vis):
+                if old != new:
+                    it.setHidden(not new)
+        finally:
+            lw.blockSignals(False)
+            lw.setUpdatesEnabled(True)
+        self._vis = vis
+        self._move_to_first()
 
     def _move_to_first(self):
-        for i in range(self.list_widget.count()):
-            it = self.list_widget.item(i)
-            if not it.isHidden():
-                self.list_widget.setCurrentRow(i)
-                return
+        try:
+            self.list_widget.setCurrentRow(self._vis.index(True))
+        except ValueError:
+            pass
 
     def _activate_current(self):
         it = self.list_widget.currentItem()
@@ -165,11 +194,17 @@ class MainWindow(QMainWindow):
         self.status_service = full_service.status_service
         self.input_service = full_service.input_service
         self.codes = load_layout_codes(cfg.layout_path)
+        self._palette: Optional[CommandPalette] = None
         self.current_period_key = "1d"
+        self._pr_cache: Optional[tuple[tuple[str, int], tuple[datetime, datetime]]] = None
+        self._gantt_pr_cache: Optional[tuple[int, tuple[datetime, datetime]]] = None
+        self._now_utc: Optional[datetime] = None
+        self._now_mono = 0.0
         self._load_state()
         self.loader = LoadController(full_service, cfg.refresh_fast_ms or 30000, self.codes, quick_mode=True)
         self.loader.first_batch_ready.connect(self._handle_initial_data)
         self.loader.progress.connect(self._on_progress)
+        self.loader.progress.connect(self._mark_dirty)
         user = _current_user()
         app = cfg.profile
         self.setWindowTitle(f"{app} | User: {user} | Design by IE")
@@ -183,9 +218,15 @@ class MainWindow(QMainWindow):
         self._gantt_interval_sec: float = 1.0
         self._gantt_sync_ts: dict[str, float] = {"Electrode": 0.0, "Assembly": 0.0}
         self._gantt_sync_interval_sec: float = 1.0
+        self._gantt_cache: dict[tuple[str, datetime], tuple[list, float]] = {}
+        self._seg_cache: dict[str, tuple[list, tuple, list]] = {}
         self._refresh_lock = asyncio.Lock()
+        self._dirty_pending = False
         self._suppress_autofit_until = 0.0
-        self._view_refresh_ms = getattr(cfg, "view_refresh_ms", 1500)
+        self._fit_timer = QTimer(self)
+        self._fit_timer.setSingleShot(True)
+        self._fit_timer.setInterval(30)
+        self._fit_timer.timeout.connect(self._do_fit_all)
         self.settings_btn = QToolButton(self)
         self.settings_btn.setObjectName("settingsBtn")
         self.settings_btn.setText("⚙️")
@@ -200,9 +241,9 @@ class MainWindow(QMainWindow):
         self.tabs.setCornerWidget(cw, Qt.Corner.TopRightCorner)
         self._init_tabs()
         self.refresh_timer = QTimer(self)
-        self.refresh_timer.setInterval(self._view_refresh_ms)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(50)
         self.refresh_timer.timeout.connect(self._refresh_device_views)
-        self.refresh_timer.start()
         self.status = QStatusBar()
         self.setStatusBar(self.status)
         palette_act = QAction("Command Palette", self)
@@ -214,8 +255,7 @@ class MainWindow(QMainWindow):
         self._history_entries: list[HistoryEntry] = []
         self._restore_geometry()
         self._disable_text_shadows()
-        QTimer.singleShot(0, self._fit_all_views)
-        QTimer.singleShot(50, self._fit_all_views)
+        self._fit_all_views()
 
     def _on_progress(self, msg: str):
         self.status.showMessage(msg, 2000)
@@ -228,6 +268,8 @@ class MainWindow(QMainWindow):
         self.status.showMessage(f"⏳ Status={self._prog_status}, Input={self._prog_input}", 1000)
 
     def _handle_initial_data(self, data: list):
+        self._gantt_cache.clear()
+        self._seg_cache.clear()
         if not data:
             return
         statuses = data[0].get("status", [])
@@ -252,13 +294,18 @@ class MainWindow(QMainWindow):
         self._last_gantt_ts[tab] = now
         self._update_gantt(tab, code)
 
+    def _mark_dirty(self, *_):
+        if self.isVisible() and not self.isMinimized() and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
     @asyncSlot()
     async def _refresh_device_views(self):
-        if not self.isVisible() or self.isMinimized():
-            return
         if self._refresh_lock.locked():
+            self._dirty_pending = True
             return
         async with self._refresh_lock:
+            self._now_utc = datetime.utcnow()
+            self._now_mono = time.monotonic()
             try:
                 idx = self.tabs.currentIndex()
                 if hasattr(self, "view_electrode") and idx == 0:
@@ -275,9 +322,25 @@ class MainWindow(QMainWindow):
                 return
             except Exception as ex:
                 self.status.showMessage(f"Refresh error: {ex}", 2000)
+        if self._dirty_pending:
+            self._dirty_pending = False
+            self._mark_dirty()
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.refresh_timer.stop()
+            else:
+                self._mark_dirty()
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        self.refresh_timer.stop()
 
     def showEvent(self, e):
         super().showEvent(e)
+        self._mark_dirty()
         self._fit_all_views()
         QTimer.singleShot(0, lambda: apply_mica(self, dark=self.cfg.theme.value.lower() == "dark", kind="tabbed"))
         QTimer.singleShot(200, self.loader.start)
@@ -287,6 +350,7 @@ class MainWindow(QMainWindow):
         self._fit_current_view(throttled=True)
 
     def _on_tab_changed(self, _idx: int):
+        self._mark_dirty()
         self._fit_current_view(throttled=True)
         self._suppress_autofit(1.0)
 
@@ -317,20 +381,13 @@ class MainWindow(QMainWindow):
             self.view_electrode = lv
             self.gantt_electrode = gantt
             self.summary_electrode = summary
-            lv.deviceSelected.connect(lambda code: self._on_device_selected("Electrode", code))
-            lv.requestStatus.connect(lambda code: self._on_device_selected("Electrode", code))
-            lv.requestWip.connect(lambda code: self._on_device_selected("Electrode", code))
-            lv.requestEip.connect(lambda code: self._on_device_selected("Electrode", code))
-            lv.requestInput.connect(lambda code: self._on_device_selected("Electrode", code))
         else:
             self.view_assembly = lv
             self.gantt_assembly = gantt
             self.summary_assembly = summary
-            lv.deviceSelected.connect(lambda code: self._on_device_selected("Assembly", code))
-            lv.requestStatus.connect(lambda code: self._on_device_selected("Assembly", code))
-            lv.requestWip.connect(lambda code: self._on_device_selected("Assembly", code))
-            lv.requestEip.connect(lambda code: self._on_device_selected("Assembly", code))
-            lv.requestInput.connect(lambda code: self._on_device_selected("Assembly", code))
+        on_selected = partial(self._on_device_selected, floor_name)
+        for sig in (lv.deviceSelected, lv.requestStatus, lv.requestWip, lv.requestEip, lv.requestInput):
+            sig.connect(on_selected)
         default_code = next(iter(lv.devices.keys()), None)
         if default_code:
             self._selected_code[floor_name] = default_code
@@ -358,57 +415,47 @@ class MainWindow(QMainWindow):
         self._selected_code[tab] = code
         self._update_gantt(tab, code)
 
+    def _utc_now(self) -> datetime:
+        if self._now_utc is not None and time.monotonic() - self._now_mono < 1.0:
+            return self._now_utc
+        return datetime.utcnow()
+
     def _today_range(self) -> tuple[datetime, datetime]:
-        now = datetime.utcnow()
+        now = self._utc_now()
         start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         return start, now
 
     def _parse_dt(self, v):
-        if isinstance(v, datetime):
-            dt = v
-        elif isinstance(v, str):
-            try:
-                dt = datetime.fromisoformat(v)
-            except Exception:
-                try:
-                    dt = datetime.strptime(v, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    return None
-        else:
+        if isinstance(v, str):
+            return _parse_dt_str(v)
+        if not isinstance(v, datetime):
             return None
-        if dt.tzinfo is not None:
-            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-        return dt
+        if v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
 
     def _build_segments(self, rows, start: datetime, clip_end: datetime, fallback_status: Optional[str] = None, fallback_time: Optional[datetime] = None):
-        events = []
+        dts, stats = [], []
         for r in rows:
             dt = self._parse_dt(r.get("event_time"))
             if dt is not None:
-                events.append((dt, r.get("equip_status")))
-        events.sort(key=lambda x: x[0])
-        initial_status = None
-        for t, s in events:
-            if t < start:
-                initial_status = s
-            else:
-                break
+                dts.append(dt)
+                stats.append(r.get("equip_status"))
+        times = np.array(dts, dtype="datetime64[us]")
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        start64 = np.datetime64(start, "us")
+        end64 = np.datetime64(clip_end, "us")
+        i0 = int(np.searchsorted(times, start64, side="left"))
+        i1 = max(i0, int(np.searchsorted(times, end64, side="right")))
+        initial_status = stats[order[i0 - 1]] if i0 > 0 else None
         if initial_status is None:
             initial_status = fallback_status
-        segs = []
-        cur_t = start
-        cur_status = initial_status
-        for t, s in events:
-            if t < start:
-                continue
-            if t > clip_end:
-                break
-            if cur_t < t:
-                segs.append((cur_t, t, cur_status))
-            cur_status = s
-            cur_t = t
-        if cur_t < clip_end:
-            segs.append((cur_t, clip_end, cur_status))
+        inside = order[i0:i1].tolist()
+        bounds = [start] + [dts[j] for j in inside] + [clip_end]
+        statuses = [initial_status] + [stats[j] for j in inside]
+        bounds64 = np.concatenate(([start64], times[i0:i1], [end64]))
+        segs = [(bounds[k], bounds[k + 1], statuses[k]) for k in np.flatnonzero(bounds64[:-1] < bounds64[1:]).tolist()]
         if not segs and fallback_status:
             start_seg = max(start, fallback_time) if isinstance(fallback_time, datetime) else start
             start_seg = min(start_seg, clip_end)
@@ -428,11 +475,29 @@ class MainWindow(QMainWindow):
         self._gantt_tasks[tab] = None
 
     def _period_range_for_gantt(self) -> tuple[datetime, datetime]:
-        now = datetime.utcnow()
+        bucket = int(time.time()) // 60
+        if self._gantt_pr_cache and self._gantt_pr_cache[0] == bucket:
+            return self._gantt_pr_cache[1]
+        now = self._utc_now()
         start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         end = start + timedelta(days=1)
+        self._gantt_pr_cache = (bucket, (start, end))
         return start, end
 
+    def _segments_for(self, tab: str, rows, start: datetime, clip_end: datetime, fallback_status: Optional[str], fallback_time: Optional[datetime]):
+        key = (len(rows), start, clip_end, fallback_status, fallback_time)
+        hit = self._seg_cache.get(tab)
+        if hit and hit[0] is rows and hit[1] == key:
+            return hit[2]
+        segs = self._build_segments(rows, start, clip_end, fallback_status=fallback_status, fallback_time=fallback_time)
+        self._seg_cache[tab] = (rows, key, segs)
+        return segs
+
+    def _put_gantt_cache(self, key: tuple[str, datetime], rows: list):
+        now = time.monotonic()
+        self._gantt_cache = {k: v for k, v in self._gantt_cache.items() if k[1] == key[1] and now - v[1] < self._gantt_interval_sec}
+        self._gantt_cache[key] = (rows, now)
+
     def _update_gantt(self, tab: str, code: Optional[str]):
         lv, gw, sb = self._get_tab_widgets(tab)
         self._cancel_gantt_task(tab)
@@ -442,25 +507,34 @@ class MainWindow(QMainWindow):
         async def run():
             try:
                 s, e_axis = self._period_range_for_gantt()
-                e_clip = min(e_axis, datetime.utcnow())
+                e_clip = min(e_axis, self._utc_now())
                 q_start = s - timedelta(days=1)
                 q_end = e_clip
-                rows = await self.status_service.query_period([code], q_start, q_end)
+                ck = (code, q_start)
+                hit = self._gantt_cache.get(ck)
+                if hit and time.monotonic() - hit[1] < self._gantt_interval_sec:
+                    rows = hit[0]
+                else:
+                    rows = await self.status_service.query_period([code], q_start, q_end)
+                    self._put_gantt_cache(ck, rows)
                 dev = lv.devices.get(code)
                 fb_status = getattr(dev, "current_status", None)
                 fb_time = getattr(dev, "latest_time", None)
-                segs = self._build_segments(rows, s, e_clip, fallback_status=fb_status, fallback_time=fb_time)
-                gw.set_segments(code, segs, s, e_axis)
+                segs = self._segments_for(tab, rows, s, e_clip, fb_status, fb_time)
+                gw.update_segments(code, segs, s, e_axis)
                 sb.set_segments(segs, s, e_clip)
                 now_ts = time.monotonic()
                 if now_ts - self._gantt_sync_ts[tab] > self._gantt_sync_interval_sec:
                     self._gantt_sync_ts[tab] = now_ts
                     try:
-                        await self.status_service.sync_period([code], s, e_clip, progress_cb=None, backfill=True)
+                        added = await self.status_service.sync_period([code], s, e_clip, progress_cb=None, backfill=True)
+                        if not added:
+                            return
                         new_rows = await self.status_service.query_period([code], q_start, q_end)
-                        segs2 = self._build_segments(new_rows, s, e_clip, fallback_status=fb_status, fallback_time=fb_time)
+                        self._put_gantt_cache(ck, new_rows)
+                        segs2 = self._segments_for(tab, new_rows, s, e_clip, fb_status, fb_time)
                         if code == self._selected_code.get(tab):
-                            gw.set_segments(code, segs2, s, e_axis)
+                            gw.update_segments(code, segs2, s, e_axis)
                             sb.set_segments(segs2, s, e_clip)
                     except Exception:
                         pass
@@ -515,6 +589,8 @@ class MainWindow(QMainWindow):
         key = self.cmb_period.currentData()
         if key in DAYS_MAP and key != self.current_period_key:
             self.current_period_key = key
+            self._pr_cache = None
+            self._seg_cache.clear()
             self._save_state()
             MiniToast(self, f"History: {self.cmb_period.currentText()}", self.cfg.theme.value)
             for entry in list(self._history_entries):
@@ -536,12 +612,13 @@ class MainWindow(QMainWindow):
                 if hasattr(self, "view_assembly"):
                     self.view_assembly.set_theme(self.cfg.theme.value)
                 apply_mica(self, dark=self.cfg.theme.value.lower() == "dark", kind="tabbed")
-                self._disable_text_shadows()
-                self._fit_all_views()
                 self._save_state()
 
     def _period_range(self) -> tuple[datetime, datetime]:
-        now = datetime.utcnow()
+        cache_key = (self.current_period_key, int(time.time()) // 60)
+        if self._pr_cache and self._pr_cache[0] == cache_key:
+            return self._pr_cache[1]
+        now = self._utc_now()
         today0 = now.replace(hour=0, minute=0, second=0, microsecond=0)
         key = self.current_period_key
         if key == "1d":
@@ -551,6 +628,7 @@ class MainWindow(QMainWindow):
             days = DAYS_MAP.get(key, 7)
             start = (today0 - timedelta(days=days))
             end = now
+        self._pr_cache = (cache_key, (start, end))
         return start, end
 
     def _register_history_dialog(self, kind: str, code: str, dlg: BaseTableDialog) -> HistoryEntry:
@@ -586,45 +664,30 @@ class MainWindow(QMainWindow):
                 return
             s, e = self._period_range()
             if entry.kind in ("status", "wip", "eip"):
-                rows = await self.status_service.query_period([entry.code], s, e)
-                if token != entry.token or not entry.dlg.isVisible():
-                    return
-                if not rows:
-                    entry.dlg.start_loading("Syncing status...")
-                else:
-                    entry.dlg.set_loading_text("Syncing status...")
-                async def run_sync():
-                    return await self.status_service.sync_period([entry.code], s, e, progress_cb=lambda src, n: entry.dlg.set_loading_text(f"Syncing {src}: {n} rows..."), backfill=True)
-                try:
-                    await asyncio.wait_for(run_sync(), timeout=timeout_sec)
-                except asyncio.TimeoutError:
-                    pass
-                if token != entry.token or not entry.dlg.isVisible():
-                    return
-                new_rows = await self.status_service.query_period([entry.code], s, e)
-                if token == entry.token and entry.dlg.isVisible():
-                    entry.dlg.load_rows([[r.get("equip_code",""), r.get("equip_status",""), r.get("event_time","")] for r in new_rows])
-                    entry.dlg.stop_loading()
+                service, label, keys = self.status_service, "status", STATUS_KEYS
             elif entry.kind == "input":
-                rows = await self.input_service.query_period([entry.code], s, e)
-                if token != entry.token or not entry.dlg.isVisible():
-                    return
-                if not rows:
-                    entry.dlg.start_loading("Syncing input...")
-                else:
-                    entry.dlg.set_loading_text("Syncing input...")
-                async def run_sync():
-                    return await self.input_service.sync_period([entry.code], s, e, progress_cb=lambda src, n: entry.dlg.set_loading_text(f"Syncing {src}: {n} rows..."), backfill=True)
-                try:
-                    await asyncio.wait_for(run_sync(), timeout=timeout_sec)
-                except asyncio.TimeoutError:
-                    pass
-                if token != entry.token or not entry.dlg.isVisible():
-                    return
-                new_rows = await self.input_service.query_period([entry.code], s, e)
-                if token == entry.token and entry.dlg.isVisible():
-                    entry.dlg.load_rows([[r.get("equip_code",""), r.get("material_batch",""), r.get("feeding_time","")] for r in new_rows])
-                    entry.dlg.stop_loading()
+                service, label, keys = self.input_service, "input", INPUT_KEYS
+            else:
+                return
+            rows = await service.query_period([entry.code], s, e)
+            if token != entry.token or not entry.dlg.isVisible():
+                return
+            if not rows:
+                entry.dlg.start_loading(f"Syncing {label}...")
+            else:
+                entry.dlg.set_loading_text(f"Syncing {label}...")
+            synced = None
+            try:
+                synced = await asyncio.wait_for(service.sync_period([entry.code], s, e, progress_cb=lambda src, n: entry.dlg.set_loading_text(f"Syncing {src}: {n} rows..."), backfill=True), timeout=timeout_sec)
+            except asyncio.TimeoutError:
+                pass
+            if token != entry.token or not entry.dlg.isVisible():
+                return
+            if synced != 0 or not rows:
+                rows = await service.query_period([entry.code], s, e)
+            if token == entry.token and entry.dlg.isVisible():
+                entry.dlg.load_rows(rows_to_matrix(rows, keys))
+                entry.dlg.stop_loading()
         except asyncio.CancelledError:
             return
         except Exception as ex:
@@ -675,8 +738,9 @@ class MainWindow(QMainWindow):
         self._restart_history_refresh(entry)
 
     def _disable_text_shadows(self):
-        for w in self.findChildren(QWidget):
-            w.setGraphicsEffect(None)
+        for w in (self.tabs, self.tabs.tabBar(), self.tabs.cornerWidget(), self.settings_btn, self.status):
+            if w is not None and w.graphicsEffect() is not None:
+                w.setGraphicsEffect(None)
 
     def _suppress_autofit(self, seconds: float = 1.5):
         self._suppress_autofit_until = time.monotonic() + seconds
@@ -691,13 +755,20 @@ class MainWindow(QMainWindow):
             self.view_assembly.fit_all()
 
     def _fit_all_views(self):
+        self._fit_timer.start()
+
+    def _do_fit_all(self):
         if hasattr(self, "view_electrode"):
             self.view_electrode.fit_all()
         if hasattr(self, "view_assembly"):
             self.view_assembly.fit_all()
 
     def _open_palette(self):
-        dlg = CommandPalette(self, self.codes, self._execute_palette)
+        if self._palette is None:
+            self._palette = CommandPalette(self, self.codes, self._execute_palette)
+        dlg = self._palette
+        if dlg.search.text():
+            dlg.search.clear()
         dlg.exec()
 
     def _execute_palette(self, act: str, code: str):
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 from PySide6.QtCore import QModelIndex, QRegularExpression
 from PySide6.QtGui import QPainter, QBrush
 from PySide6.QtWidgets import QStyledItemDelegate
@@ -14,21 +14,42 @@ class CellDelegate(QStyledItemDelegate):
         self._should_highlight_col = should_highlight_col
         self._get_cell_bg = get_cell_bg
         self._highlight_brush = highlight_brush
+        self._hit_regex: Optional[QRegularExpression] = None
+        self._hits: Dict[str, bool] = {}
+        self._regex: Optional[QRegularExpression] = None
+        self._hl_cols: Dict[int, bool] = {}
+        self._stale = True
+
+    def invalidate_regex(self):
+        self._stale = True
 
     def set_highlight_brush(self, brush: QBrush):
         self._highlight_brush = brush
 
     def paint(self, painter: QPainter, option, index: QModelIndex):
+        if self._stale:
+            self._regex = self._get_regex()
+            self._hl_cols = {}
+            self._stale = False
         bg = self._get_cell_bg(index)
         if bg is not None:
-            painter.save()
             painter.fillRect(option.rect, bg)
-            painter.restore()
-        regex = self._get_regex()
+        regex = self._regex
+        if regex is None:
+            super().paint(painter, option, index)
+            return
+        col = index.column()
+        hl = self._hl_cols.get(col)
+        if hl is None:
+            hl = self._hl_cols[col] = self._should_highlight_col(col)
         text = index.data()
-        if regex is not None and isinstance(text, str) and self._should_highlight_col(index.column()):
-            if regex.match(text).hasMatch():
-                painter.save()
+        if hl and isinstance(text, str):
+            if regex is not self._hit_regex or len(self._hits) > 4096:
+                self._hit_regex = regex
+                self._hits = {}
+            hit = self._hits.get(text)
+            if hit is None:
+                hit = self._hits[text] = regex.match(text).hasMatch()
+            if hit:
                 painter.fillRect(option.rect, self._highlight_brush)
-                painter.restore()
         super().paint(painter, option, index)
\ No newline at end of file
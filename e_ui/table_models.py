@@ -1,14 +1,57 @@
 from __future__ import annotations
-from typing import List, Optional, Any
-from PySide6.QtCore import Qt, QSortFilterProxyModel, QModelIndex, QAbstractTableModel, QRegularExpression
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import re
+import sys
+import numpy as np
+from PySide6.QtCore import Qt, QSortFilterProxyModel, QModelIndex, QAbstractTableModel, QRegularExpression, QTimer
 from PySide6.QtWidgets import QWidget
-from e_ui.utils import strip_accents
+from e_ui.utils import strip_accents, normalize_column, join_fields
+
+_REGEX_META = re.compile(r"[.^$*+?(){}\[\]|\\]")
+
+def _has_regex_metachars(s: str) -> bool:
+    return _REGEX_META.search(s) is not None
+
+def _regex_fast_predicate(pattern: str, exact: bool, case_sensitive: bool) -> Optional[Callable[[str], bool]]:
+    if exact and not pattern.startswith("^"):
+        pattern = f"^{pattern}$"
+    start = pattern.startswith("^")
+    body = pattern[1:] if start else pattern
+    end = body.endswith("$") and not body.endswith("\\$")
+    if end:
+        body = body[:-1]
+    if body == ".*":
+        return lambda s: True
+    if body == ".+":
+        return lambda s: bool(s)
+    if _has_regex_metachars(body):
+        return None
+    lit = body if case_sensitive else body.lower()
+    fold = (lambda s: s) if case_sensitive else str.lower
+    if start and end:
+        return lambda s: fold(s) == lit
+    if start:
+        return lambda s: fold(s).startswith(lit)
+    if end:
+        return lambda s: fold(s).endswith(lit)
+    return lambda s: lit in fold(s)
+
+def _to_float(s: str) -> Optional[float]:
+    try:
+        return float(s.replace(",", ""))
+    except ValueError:
+        return None
+
+def _stringify(rows: List[List[Any]]) -> List[List[str]]:
+    return [["" if v is None else str(v) for v in row] for row in rows]
 
 class TableDataModel(QAbstractTableModel):
     def __init__(self, headers: List[str], rows: Optional[List[List[Any]]] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self._headers = headers[:]
+        self._headers: Tuple[str, ...] = tuple(sys.intern(h) for h in headers)
         self._rows: List[List[Any]] = rows[:] if rows else []
+        self._str_rows: List[List[str]] = _stringify(self._rows)
+        self._columns: Dict[int, np.ndarray] = {}
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return 0 if parent.isValid() else len(self._rows)
@@ -17,13 +60,13 @@ class TableDataModel(QAbstractTableModel):
         return 0 if parent.isValid() else len(self._headers)
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole and role != Qt.EditRole:
+            return None
         if not index.isValid():
             return None
-        if role in (Qt.DisplayRole, Qt.EditRole):
-            r, c = index.row(), index.column()
-            val = self._rows[r][c] if c < len(self._rows[r]) else ""
-            return "" if val is None else str(val)
-        return None
+        row = self._str_rows[index.row()]
+        c = index.column()
+        return row[c] if c < len(row) else ""
 
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
         if role != Qt.DisplayRole:
@@ -39,19 +82,32 @@ class TableDataModel(QAbstractTableModel):
 
     def set_headers(self, headers: List[str]) -> None:
         self.beginResetModel()
-        self._headers = headers[:]
+        self._headers = tuple(sys.intern(h) for h in headers)
         self.endResetModel()
 
     def set_rows(self, rows: List[List[Any]]) -> None:
         self.beginResetModel()
         self._rows = rows[:]
+        self._str_rows = _stringify(self._rows)
+        self._columns = {}
         self.endResetModel()
 
     def clear(self) -> None:
         self.set_rows([])
 
-    def headers(self) -> List[str]:
-        return self._headers[:]
+    def headers(self) -> Tuple[str, ...]:
+        return self._headers
+
+    def row_strings(self, r: int) -> List[str]:
+        return self._str_rows[r]
+
+    def column_strings(self, c: int) -> np.ndarray:
+        col = self._columns.get(c)
+        if col is None:
+            col = np.empty(len(self._rows), dtype=object)
+            col[:] = [r[c] if c < len(r) else "" for r in self._str_rows]
+            self._columns[c] = col
+        return col
 
 class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
     def __init__(self, parent: Optional[QWidget] = None):
@@ -64,11 +120,26 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
         self._logic_and: bool = False
         self._filter_key_col: int = -1
         self._highlight_re: Optional[QRegularExpression] = None
+        self._highlight_key: Optional[tuple[str, bool, bool, bool]] = None
+        self._regex_fast: Optional[Callable[[str], bool]] = None
+        self._token_pats_key: Optional[tuple] = None
+        self._token_pats: List[tuple[str, re.Pattern]] = []
         self._tokens: List[str] = []
         self._row_fields_cache: List[Optional[List[str]]] = []
+        self._row_joined_cache: List[Optional[str]] = []
+        self._scan_buf: Optional[tuple[list, int, str, np.ndarray]] = None
         self._cache_cols_key: Optional[tuple[int, ...]] = None
         self._cache_norm_key: Optional[tuple[bool, bool]] = None
+        self._accept_mask: Optional[np.ndarray] = None
+        self._accepted: Optional[List[bool]] = None
+        self._sort_keys: Dict[int, List[tuple[Optional[float], str]]] = {}
+        self._sort_norm_key: Optional[tuple[bool, bool]] = None
+        self._applied: Optional[Any] = None
         self._bound_model = None
+        self._invalidate_timer = QTimer(self)
+        self._invalidate_timer.setSingleShot(True)
+        self._invalidate_timer.setInterval(30)
+        self._invalidate_timer.timeout.connect(self.invalidateFilter)
 
     def setSourceModel(self, sourceModel):
         super().setSourceModel(sourceModel)
@@ -96,21 +167,38 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
             m.dataChanged.connect(self._on_source_data_changed)
 
     def _on_source_reset(self):
+        self._invalidate_timer.stop()
         self._reset_cache()
         self.invalidateFilter()
 
     def _on_rows_changed(self, *args):
         self._resize_cache()
-        self.invalidateFilter()
+        self._invalidate_timer.start()
 
-    def _on_source_data_changed(self, *args):
-        self._reset_cache()
-        self.invalidateFilter()
+    def _on_source_data_changed(self, top_left: Optional[QModelIndex] = None, bottom_right: Optional[QModelIndex] = None, *args):
+        if top_left is None or bottom_right is None or not top_left.isValid() or not bottom_right.isValid():
+            self._reset_cache()
+        else:
+            hi = min(bottom_right.row(), len(self._row_fields_cache) - 1)
+            for r in range(max(0, top_left.row()), hi + 1):
+                self._row_fields_cache[r] = None
+                self._row_joined_cache[r] = None
+            self._scan_buf = None
+            self._accept_mask = None
+            self._accepted = None
+            self._sort_keys = {}
+            self._applied = None
+        self._invalidate_timer.start()
 
     def _resize_cache(self):
+        self._accept_mask = None
+        self._accepted = None
+        self._sort_keys = {}
+        self._applied = None
         m = self.sourceModel()
         if m is None:
             self._row_fields_cache = []
+            self._row_joined_cache = []
             return
         n = m.rowCount()
         cur = len(self._row_fields_cache)
@@ -118,27 +206,40 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
             return
         if n > cur:
             self._row_fields_cache.extend([None] * (n - cur))
+            self._row_joined_cache.extend([None] * (n - cur))
         else:
             self._row_fields_cache = self._row_fields_cache[:n]
+            self._row_joined_cache = self._row_joined_cache[:n]
 
     def _reset_cache(self):
         m = self.sourceModel()
         n = m.rowCount() if m else 0
         self._row_fields_cache = [None] * n
+        self._row_joined_cache = [None] * n
         self._cache_cols_key = None
         self._cache_norm_key = None
+        self._accept_mask = None
+        self._accepted = None
+        self._sort_keys = {}
+        self._applied = None
 
-    def set_prebuilt_cache(self, cache: List[List[str]], cols_key: tuple[int, ...], norm_key: tuple[bool, bool]):
+    def set_prebuilt_cache(self, cache: List[List[str]], cols_key: tuple[int, ...], norm_key: tuple[bool, bool], joined: Optional[List[str]] = None):
         m = self.sourceModel()
         if m is None:
             return
         if len(cache) != m.rowCount():
             return
-        self._row_fields_cache = [fields[:] for fields in cache]
+        self._row_fields_cache = list(cache)
+        self._row_joined_cache = list(joined) if joined is not None and len(joined) == len(cache) else [None] * len(cache)
         self._cache_cols_key = cols_key
         self._cache_norm_key = norm_key
+        self._accept_mask = None
+        self._accepted = None
         self.invalidateFilter()
 
+    def cache_matches(self, cols_key: tuple[int, ...], norm_key: tuple[bool, bool]) -> bool:
+        return self._cache_cols_key == tuple(cols_key) and self._cache_norm_key == tuple(norm_key) and None not in self._row_joined_cache
+
     def setFilterParams(self, text: str, is_regex: bool, exact: bool, case_sensitive: bool, ignore_accents: bool, logic_and: bool, key_col: int):
         self._text = text or ""
         self._is_regex = is_regex
@@ -148,11 +249,32 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
         self._logic_and = logic_and
         self._filter_key_col = int(key_col) if isinstance(key_col, int) else -1
         self._tokens = [t for t in self._text.split() if t]
-        self._highlight_re = self._make_highlight_regex()
-        self.setFilterRegularExpression(self._highlight_re or QRegularExpression())
-        self._reset_cache()
+        key = (self._text, self._is_regex, self._exact, self._case_sensitive)
+        if key != self._highlight_key:
+            self._highlight_key = key
+            self._highlight_re = self._make_highlight_regex()
+            self._regex_fast = _regex_fast_predicate(self._text, self._exact, self._case_sensitive) if self._is_regex and self._text else None
+        self._accept_mask = None
+        self._accepted = None
+        self._ensure_cache_key_current()
+        applied = self._effective_filter()
+        if applied is not None and applied == self._applied:
+            return
+        self._applied = applied
         self.invalidateFilter()
 
+    def _effective_filter(self) -> Optional[Any]:
+        if not self._text or (not self._is_regex and not self._tokens):
+            return True
+        if self._is_regex:
+            return None
+        m = self.sourceModel()
+        if m is None:
+            return None
+        self._accept_mask = self._build_accept_mask()
+        self._accepted = self._accept_mask.tolist()
+        return self._accepted
+
     def highlight_regex(self) -> Optional[QRegularExpression]:
         return self._highlight_re
 
@@ -172,37 +294,124 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
             if self._exact and not pattern.startswith("^"):
                 pattern = f"^{pattern}$"
             opts = QRegularExpression.CaseInsensitiveOption if not self._case_sensitive else QRegularExpression.NoPatternOption
-            return QRegularExpression(pattern, opts)
+            rx = QRegularExpression(pattern, opts)
+            rx.optimize()
+            return rx
         tokens = [t for t in self._text.split() if t]
         if not tokens:
             return None
-        pat = "|".join(QRegularExpression.escape(t) for t in tokens)
+        pat = "(?:" + "|".join(QRegularExpression.escape(t) for t in tokens) + ")"
         opts = QRegularExpression.CaseInsensitiveOption if not self._case_sensitive else QRegularExpression.NoPatternOption
-        return QRegularExpression(pat, opts)
+        rx = QRegularExpression(pat, opts | QRegularExpression.DontCaptureOption)
+        rx.optimize()
+        return rx
 
     def _selected_columns(self, model) -> List[int]:
         if self._filter_key_col is None or self._filter_key_col < 0:
             return list(range(model.columnCount()))
         return [self._filter_key_col]
 
-    def _ensure_row_cache(self, row: int):
+    def _ensure_cache_key_current(self) -> tuple[int, ...]:
         m = self.sourceModel()
         if m is None:
-            return
+            return ()
         cols = tuple(self._selected_columns(m))
         norm_key = (self._case_sensitive, self._ignore_accents)
         if self._cache_cols_key != cols or self._cache_norm_key != norm_key:
-            self._row_fields_cache = [None] * m.rowCount()
+            n = m.rowCount()
+            self._row_fields_cache = [None] * n
+            self._row_joined_cache = [None] * n
             self._cache_cols_key = cols
             self._cache_norm_key = norm_key
-        if 0 <= row < len(self._row_fields_cache) and self._row_fields_cache[row] is None:
-            fields: List[str] = []
+        return cols
+
+    def _fill_row(self, m, cols: tuple[int, ...], row: int) -> List[str]:
+        fields = self._row_fields_cache[row]
+        if fields is None:
+            fields = []
             for c in cols:
                 idx = m.index(row, c)
                 val = idx.data() or ""
                 s = val if isinstance(val, str) else str(val)
                 fields.append(self._norm(s))
             self._row_fields_cache[row] = fields
+        return fields
+
+    def _ensure_row_cache(self, row: int):
+        m = self.sourceModel()
+        if m is None:
+            return
+        cols = self._cache_cols_key if self._cache_cols_key is not None else self._ensure_cache_key_current()
+        if 0 <= row < len(self._row_fields_cache):
+            self._fill_row(m, cols, row)
+
+    def _fill_all(self, m, cols: tuple[int, ...]):
+        norm = [normalize_column(m.column_strings(c).tolist(), self._case_sensitive, self._ignore_accents) for c in cols]
+        n = len(self._row_fields_cache)
+        self._row_fields_cache = list(map(list, zip(*norm))) if norm else [[] for _ in range(n)]
+        self._row_joined_cache = list(map(join_fields, self._row_fields_cache))
+
+    def _row_texts(self, m) -> List[str]:
+        cols = self._ensure_cache_key_current()
+        if hasattr(m, "column_strings") and self._row_fields_cache.count(None) == len(self._row_fields_cache):
+            self._fill_all(m, cols)
+        joined = self._row_joined_cache
+        for r, s in enumerate(joined):
+            if s is None:
+                joined[r] = join_fields(self._fill_row(m, cols, r))
+                self._scan_buf = None
+        return joined
+
+    def _scan_buffer(self, m) -> tuple[str, np.ndarray]:
+        rows_text = self._row_texts(m)
+        sb = self._scan_buf
+        if sb is None or sb[0] is not rows_text or sb[1] != len(rows_text):
+            lens = np.fromiter(map(len, rows_text), dtype=np.int64, count=len(rows_text)) + 1
+            starts = np.concatenate(([0], np.cumsum(lens)[:-1]))
+            sb = self._scan_buf = (rows_text, len(rows_text), "\x1e".join(rows_text), starts)
+        return sb[2], sb[3]
+
+    def _token_patterns(self, tokens: List[str]) -> List[tuple[str, re.Pattern]]:
+        key = (tuple(tokens), self._exact, self._logic_and)
+        if key != self._token_pats_key:
+            lits = list(dict.fromkeys(f"\x1f{tok}\x1f" if self._exact else tok for tok in tokens))
+            if self._logic_and:
+                lits.sort(key=len, reverse=True)
+                self._token_pats = [(lit, re.compile(re.escape(lit))) for lit in lits]
+            else:
+                self._token_pats = [("", re.compile("|".join(map(re.escape, lits))))]
+            self._token_pats_key = key
+        return self._token_pats
+
+    def _build_accept_mask(self) -> np.ndarray:
+        m = self.sourceModel()
+        n = m.rowCount() if m is not None else 0
+        tokens = [self._norm(t) for t in self._tokens]
+        if not tokens or n == 0:
+            return np.ones(n, dtype=bool)
+        buf, starts = self._scan_buffer(m)
+        mask = np.ones(n, dtype=bool) if self._logic_and else np.zeros(n, dtype=bool)
+        rows_text = self._row_joined_cache
+        for lit, pat in self._token_patterns(tokens):
+            if self._logic_and:
+                cand = np.flatnonzero(mask)
+                if cand.size * 8 < n:
+                    keep = np.fromiter((lit in rows_text[i] for i in cand.tolist()), dtype=bool, count=cand.size)
+                    mask[cand[~keep]] = False
+                    if not keep.any():
+                        break
+                    continue
+            pos = np.fromiter((mt.start() for mt in pat.finditer(buf)), dtype=np.int64)
+            hit = np.zeros(n, dtype=bool)
+            if pos.size:
+                hit[np.searchsorted(starts, pos, side="right") - 1] = True
+            if self._logic_and:
+                mask &= hit
+                if not mask.any():
+                    break
+            else:
+                mask |= hit
+        return mask
 
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
         if not self._text:
@@ -214,32 +423,57 @@ class ExtendedSortFilterProxyModel(QSortFilterProxyModel):
             rexp = self._highlight_re
             if rexp is None:
                 return True
+            match = self._regex_fast or (lambda s: rexp.match(s).hasMatch())
+            if isinstance(m, TableDataModel):
+                ncols = m.columnCount()
+                row = m.row_strings(source_row)
+                if self._filter_key_col is None or self._filter_key_col < 0:
+                    vals = row[:ncols] if len(row) >= ncols else row + [""] * (ncols - len(row))
+                    return any(map(match, vals))
+                kc = self._filter_key_col
+                return match(row[kc] if kc < min(len(row), ncols) else "")
+            index = m.index
             if self._filter_key_col is None or self._filter_key_col < 0:
                 for c in range(m.columnCount()):
-                    idx = m.index(source_row, c)
-                    val = idx.data() or ""
-                    s = val if isinstance(val, str) else str(val)
-                    if rexp.match(s).hasMatch():
+                    val = index(source_row, c).data() or ""
+                    if match(val if isinstance(val, str) else str(val)):
                         return True
                 return False
-            idx = m.index(source_row, self._filter_key_col)
-            val = idx.data() or ""
-            s = val if isinstance(val, str) else str(val)
-            return rexp.match(s).hasMatch()
-        self._ensure_row_cache(source_row)
-        fields = self._row_fields_cache[source_row] or []
+            val = index(source_row, self._filter_key_col).data() or ""
+            return match(val if isinstance(val, str) else str(val))
         if not self._tokens:
             return True
-        tokens_norm = [self._norm(t) for t in self._tokens]
-        def token_in_fields(tok: str) -> bool:
-            if self._exact:
-                return any(tok == f for f in fields)
-            return any(tok in f for f in fields)
-        if self._logic_and:
-            return all(token_in_fields(t) for t in tokens_norm)
-        return any(token_in_fields(t) for t in tokens_norm)
+        acc = self._accepted
+        if acc is None:
+            if self._accept_mask is None:
+                self._accept_mask = self._build_accept_mask()
+            acc = self._accepted = self._accept_mask.tolist()
+        return acc[source_row] if 0 <= source_row < len(acc) else True
+
+    def _column_sort_keys(self, m, c: int) -> List[tuple[Optional[float], str]]:
+        norm_key = (self._case_sensitive, self._ignore_accents)
+        if self._sort_norm_key != norm_key:
+            self._sort_keys = {}
+            self._sort_norm_key = norm_key
+        keys = self._sort_keys.get(c)
+        if keys is None:
+            if hasattr(m, "column_strings"):
+                vals = m.column_strings(c).tolist()
+            else:
+                vals = [("" if v is None else str(v)) for v in (m.index(r, c).data() for r in range(m.rowCount()))]
+            norm = normalize_column(vals, self._case_sensitive, self._ignore_accents)
+            keys = self._sort_keys[c] = [(_to_float(v), s) for v, s in zip(vals, norm)]
+        return keys
 
     def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        m = self.sourceModel()
+        keys = self._column_sort_keys(m, left.column())
+        l, r = left.row(), right.row()
+        if left.column() == right.column() and 0 <= l < len(keys) and 0 <= r < len(keys):
+            lk, rk = keys[l], keys[r]
+            if lk[0] is not None and rk[0] is not None:
+                return lk[0] < rk[0]
+            return lk[1] < rk[1]
         lv = self.sourceModel().data(left, Qt.DisplayRole)
         rv = self.sourceModel().data(right, Qt.DisplayRole)
         try:
@@ -1,14 +1,16 @@
 from __future__ import annotations
 from typing import Dict, Union, Optional, cast
+from functools import lru_cache
 import sys
 from PySide6.QtCore import QObject, Signal
-from PySide6.QtGui import QColor, QPalette
+from PySide6.QtGui import QBrush, QColor, QPalette
 from PySide6.QtWidgets import QApplication, QStyleFactory
 
 ThemeStatusMap = Dict[Optional[str], str]
 ThemeColors = Dict[str, Union[str, ThemeStatusMap]]
 ACCENT_DEFAULT = "#0F6CBD"
 
+@lru_cache(maxsize=1)
 def _win_accent_hex() -> Optional[str]:
     if sys.platform != "win32":
         return None
@@ -98,6 +100,7 @@ def make_palette(colors: ThemeColors) -> QPalette:
     p.setColor(QPalette.ColorGroup.Disabled, QPalette.ColorRole.Base, QColor(surface_alt))
     return p
 
+@lru_cache(maxsize=64)
 def _hex_to_rgba(s: str, alpha: float) -> str:
     s = s.strip()
     if s.startswith("#"):
@@ -297,17 +300,32 @@ class ThemeBus(QObject):
 
 theme_bus = ThemeBus()
 _current_theme_name = "light"
+_STYLESHEETS: Dict[str, str] = {}
+_PALETTES: Dict[str, QPalette] = {}
+_STATUS_BRUSHES: Dict[tuple[str, int], Dict[Optional[str], QBrush]] = {}
 
 def apply_theme(app: QApplication, theme: str) -> None:
     global _current_theme_name
     theme = (theme or "light").lower()
     colors = THEMES.get(theme, THEMES["light"])
+    key = theme if theme in THEMES else "light"
+    palette = _PALETTES.get(key)
+    if palette is None:
+        palette = _PALETTES[key] = make_palette(colors)
+    sheet = _STYLESHEETS.get(key)
+    if sheet is None:
+        sheet = _STYLESHEETS[key] = make_stylesheet(colors)
     app.setStyle(QStyleFactory.create("Fusion"))
-    app.setPalette(make_palette(colors))
-    app.setStyleSheet(make_stylesheet(colors))
+    app.setPalette(palette)
+    app.setStyleSheet(sheet)
     _current_theme_name = theme
     theme_bus.changed.emit(theme, colors)
 
+@lru_cache(maxsize=1)
+def _dwmapi():
+    import ctypes
+    return ctypes.WinDLL("dwmapi")
+
 def apply_mica(widget, dark: bool = False, kind: str = "tabbed") -> bool:
     if sys.platform != "win32":
         return False
@@ -315,7 +333,7 @@ def apply_mica(widget, dark: bool = False, kind: str = "tabbed") -> bool:
         import ctypes
         from ctypes import wintypes
         hwnd = int(widget.winId())
-        dwmapi = ctypes.WinDLL("dwmapi")
+        dwmapi = _dwmapi()
         DWMWA_USE_IMMERSIVE_DARK_MODE = 20
         val = ctypes.c_int(1 if dark else 0)
         dwmapi.DwmSetWindowAttribute(wintypes.HWND(hwnd), ctypes.c_uint(DWMWA_USE_IMMERSIVE_DARK_MODE), ctypes.byref(val), ctypes.sizeof(val))
@@ -331,6 +349,18 @@ def apply_mica(widget, dark: bool = False, kind: str = "tabbed") -> bool:
     except Exception:
         return False
 
+def status_brushes(name: str, alpha: int) -> Dict[Optional[str], QBrush]:
+    key = (name, alpha)
+    brushes = _STATUS_BRUSHES.get(key)
+    if brushes is None:
+        brushes = {}
+        for st, hexc in cast(ThemeStatusMap, theme_colors(name)["status"]).items():
+            c = QColor(hexc)
+            c.setAlpha(alpha)
+            brushes[st] = QBrush(c)
+        _STATUS_BRUSHES[key] = brushes
+    return brushes
+
 def current_theme_name() -> str:
     return _current_theme_name
 
@@ -1,10 +1,73 @@
 from __future__ import annotations
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Sequence
+from functools import lru_cache
+import re
 import unicodedata
+import warnings
 from datetime import datetime, timezone
+import numpy as np
+
+_VECTOR_MIN_LEN = 256
+_combining_mask: Optional[np.ndarray] = None
+_accent_table: Optional[Dict[int, Optional[str]]] = None
+_UNMAPPED_RE = re.compile("[^\x00-\ud7ff\ue000-\uffff]")
+_ISO_DT_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}[ T][0-9]{2}:[0-9]{2}:[0-9]{2}(?:\.[0-9]{1,6})?")
+
+def _get_accent_table() -> Dict[int, Optional[str]]:
+    global _accent_table
+    if _accent_table is None:
+        table: Dict[int, Optional[str]] = {}
+        for cp in (*range(0x80, 0xD800), *range(0xE000, 0x10000)):
+            ch = chr(cp)
+            out = "".join(c for c in unicodedata.normalize("NFD", ch) if not unicodedata.combining(c))
+            if out != ch:
+                table[cp] = out or None
+        _accent_table = table
+    return _accent_table
+
+def _get_combining_mask() -> np.ndarray:
+    global _combining_mask
+    if _combining_mask is None:
+        mask = np.zeros(0x110000, dtype=bool)
+        mask[[cp for cp in range(0x110000) if unicodedata.combining(chr(cp))]] = True
+        _combining_mask = mask
+    return _combining_mask
+
+@lru_cache(maxsize=65536)
+def _strip_short(text: str) -> str:
+    if _UNMAPPED_RE.search(text) is None:
+        return text.translate(_get_accent_table())
+    text = unicodedata.normalize("NFD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
 
 def strip_accents(text: str) -> str:
-    return "".join(ch for ch in unicodedata.normalize("NFD", text) if not unicodedata.combining(ch))
+    if text.isascii():
+        return text
+    if len(text) < _VECTOR_MIN_LEN:
+        return _strip_short(text)
+    text = unicodedata.normalize("NFD", text)
+    cps = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    return cps[~_get_combining_mask()[cps]].tobytes().decode("utf-32-le", "surrogatepass")
+
+def normalize_column(vals: List[str], case_sensitive: bool, ignore_accents: bool, sep: str = "\x00") -> List[str]:
+    if not vals or (case_sensitive and not ignore_accents):
+        return vals
+    buf = sep.join(vals)
+    if buf.count(sep) != len(vals) - 1:
+        if not case_sensitive:
+            vals = [v.lower() for v in vals]
+        return [strip_accents(v) for v in vals] if ignore_accents else vals
+    if not case_sensitive:
+        buf = buf.lower()
+    if ignore_accents:
+        buf = strip_accents(buf)
+    return buf.split(sep)
+
+def join_fields(fields: List[str], sep: str = "\x1f") -> str:
+    buf = sep.join(fields)
+    if fields and buf.count(sep) != len(fields) - 1:
+        buf = sep.join(f.replace(sep, " ") for f in fields)
+    return sep + buf + sep
 
 def to_datetime(v: Any) -> Optional[datetime]:
     dt: Optional[datetime] = None
@@ -22,4 +85,19 @@ def to_datetime(v: Any) -> Optional[datetime]:
         return None
     if dt.tzinfo is not None:
         dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-    return dt
\ No newline at end of file
+    return dt
+
+def to_datetime_array(values: Sequence[Any]) -> np.ndarray:
+    match = _ISO_DT_RE.fullmatch
+    if all(v is None or (type(v) is str and match(v)) for v in values):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                return np.array(values, dtype="datetime64[us]")
+        except (ValueError, TypeError, UserWarning):
+            pass
+    out = np.empty(len(values), dtype="datetime64[us]")
+    for i, v in enumerate(values):
+        dt = to_datetime(v)
+        out[i] = np.datetime64(dt, "us") if dt is not None else np.datetime64("NaT")
+    return out
\ No newline at end of file